@@ -0,0 +1,41 @@
+import argparse
+import os
+import tempfile
+from benchmarks.synthetic import make_database
+from sql.instantiator import Instantiator
+
+"""
+Compares cold (database) and warm (snapshot) catalog loads.
+Run from the repository root: `python -m benchmarks.bench_instantiator --rows 50000`
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000, help="rows per content table")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_database(os.path.join(directory, "content.db"), args.rows)
+
+        cold = []
+        warm = []
+        for _ in range(args.repeat):
+            if os.path.exists(f"{path}.snapshot"):
+                os.remove(f"{path}.snapshot")
+            with Instantiator(path) as inst:
+                inst.load()
+            cold.append(inst.load_time)
+
+            with Instantiator(path) as inst:
+                inst.load()
+            assert inst.source == "snapshot"
+            warm.append(inst.load_time)
+
+        print(f"{args.rows} rows per table, best of {args.repeat}")
+        print(f"cold (database): {min(cold) * 1000:9.1f} ms")
+        print(f"warm (snapshot): {min(warm) * 1000:9.1f} ms")
+        print(f"speedup:         {min(cold) / min(warm):9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from benchmarks.synthetic import make_database
+from sql.entry import DataEntry
+
+"""
+Compares file-backed and in-memory (`in_memory=True`) read performance.
+Run from the repository root: `python -m benchmarks.bench_memory --rows 50000`
+"""
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000, help="rows per content table")
+    parser.add_argument("--gets", type=int, default=20_000, help="random single-row lookups")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_database(os.path.join(directory, "content.db"), args.rows)
+        keys = [f"equip_{random.randrange(args.rows)}" for _ in range(args.gets)]
+
+        print(f"{args.rows} rows per table, {args.gets} lookups")
+        print(f"{'mode':<8} {'load':>10} {'get':>10} {'read':>10}")
+        for label, options in (("file", {}), ("memory", {'in_memory': True})):
+            with DataEntry(path, **options) as entry:
+                load = timed(lambda: entry.get('equip', keys[0]))
+                gets = timed(lambda: [entry.get('equip', key) for key in keys])
+                reads = timed(lambda: [entry.read(table) for table in ('item', 'usable', 'equip')])
+            print(f"{label:<8} {load * 1000:8.1f}ms {gets * 1000:8.1f}ms {reads * 1000:8.1f}ms")
+
+if __name__ == "__main__":
+    main()
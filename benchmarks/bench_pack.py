@@ -0,0 +1,61 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from benchmarks.synthetic import make_database
+from sql.entry import DataEntry
+from sql.instantiator import Instantiator
+from sql.pack import ContentPack, compile_pack
+
+"""
+Compares opening a compiled content pack against a warm snapshot load, and pack lookups against `DataEntry.get`.
+Run from the repository root: `python -m benchmarks.bench_pack --rows 100000`
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows per content table")
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_database(os.path.join(directory, "content.db"), args.rows)
+        pack_path = os.path.join(directory, "content.pack")
+
+        start = time.perf_counter()
+        with DataEntry(path) as entry:
+            compile_pack(entry, pack_path)
+        print(f"{args.rows} rows per table, pack is {os.path.getsize(pack_path) / 2**20:.1f} MiB")
+        print(f"compile:              {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        with Instantiator(path) as inst:
+            inst.load()
+        with Instantiator(path) as inst:
+            inst.load()
+        print(f"snapshot load:        {inst.load_time * 1000:9.1f} ms")
+
+        start = time.perf_counter()
+        pack = ContentPack(pack_path)
+        print(f"pack open:            {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        with DataEntry(path) as entry:
+            keys = [row[0] for row in entry.iter_read('equip', columns=['ref_id'])]
+            sample = [random.choice(keys) for _ in range(args.lookups)]
+
+            start = time.perf_counter()
+            for key in sample:
+                pack.get('equip', key)
+            packed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for key in sample:
+                entry.get('equip', key, decode=True)
+            database = time.perf_counter() - start
+
+        pack.close()
+        print(f"pack get:             {packed / args.lookups * 1e6:9.2f} us")
+        print(f"DataEntry.get:        {database / args.lookups * 1e6:9.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.synthetic import make_database
+from sql.entry import DataEntry
+
+"""
+Compares keyset pagination (`DataEntry.read_page`) against LIMIT/OFFSET at increasing depths,
+ordered by the unique `ref_id`, by `name`, and by the low-cardinality `element` and `dual_wield`, in both directions.
+Run from the repository root: `python -m benchmarks.bench_pages --rows 500000`
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000, help="rows per content table")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_database(os.path.join(directory, "content.db"), args.rows)
+        with DataEntry(path) as entry:
+            entry.migrate()
+
+            start = time.perf_counter()
+            total = entry.count('equip')
+            print(f"{total} rows, count in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+            for fraction in (0.0, 0.25, 0.5, 0.99):
+                depth = int(total * fraction)
+                after = None
+                if depth > 0:
+                    after = entry.database.db_query("SELECT ref_id FROM equip ORDER BY ref_id LIMIT 1 OFFSET :depth;", {'depth': depth - 1})[0][0]
+
+                for order_by in ("ref_id", "name", "element", "-element", "dual_wield", "-dual_wield"):
+                    start = time.perf_counter()
+                    for _ in range(args.repeat):
+                        entry.read_page('equip', after, args.limit, order_by)
+                    keyset = (time.perf_counter() - start) / args.repeat
+
+                    column, direction = order_by.removeprefix("-"), "DESC" if order_by.startswith("-") else "ASC"
+                    request = f"SELECT * FROM equip ORDER BY {column} {direction}, ref_id {direction} LIMIT :limit OFFSET :offset;"
+                    start = time.perf_counter()
+                    for _ in range(args.repeat):
+                        entry.database.db_query(request, {'limit': args.limit, 'offset': depth})
+                    offset = (time.perf_counter() - start) / args.repeat
+
+                    print(f"depth {depth:>7} by {order_by:11}  keyset {keyset * 1000:7.2f} ms   offset {offset * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
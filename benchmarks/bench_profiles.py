@@ -0,0 +1,78 @@
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from benchmarks.synthetic import TEMPLATE_DB_PATH, item_row
+from sql.entry import DataEntry
+
+"""
+Measures bulk-import speed and reader/writer concurrency under each pragma profile.
+Run from the repository root: `python -m benchmarks.bench_profiles --rows 100000`
+"""
+
+WRITE_PROFILES = ("default", "editor", "bulk-import")
+
+def bulk_import(path: str, profile: str, rows: int, chunk_size: int) -> float:
+    with DataEntry(path, profile=profile) as entry:
+        start = time.perf_counter()
+        entry.add_many('item', (item_row(i) for i in range(rows)), chunk_size=chunk_size)
+        return time.perf_counter() - start
+
+def concurrency(path: str, profile: str, seconds: float) -> tuple[int, int, float]:
+    """
+    Runs one writer (single-row commits) against one reader (point lookups) and returns
+    the writes and reads completed, and the reader's worst latency
+    """
+    stop = threading.Event()
+    counts = {'writes': 0, 'reads': 0, 'worst': 0.0}
+    reader_profile = "runtime-readonly" if profile != "default" else "default"
+
+    def writer():
+        with DataEntry(path, profile=profile) as entry:
+            i = 0
+            while not stop.is_set():
+                entry.add('item', item_row(10_000_000 + i))
+                i += 1
+            counts['writes'] = i
+
+    def reader():
+        with DataEntry(path, profile=reader_profile) as entry:
+            while not stop.is_set():
+                start = time.perf_counter()
+                entry.get('item', "item_1")
+                counts['worst'] = max(counts['worst'], time.perf_counter() - start)
+                counts['reads'] += 1
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts['writes'], counts['reads'], counts['worst']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows to bulk import")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of the concurrency run")
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'import rows/s':>14} {'writes/s':>10} {'reads/s':>10} {'worst read':>11}")
+    for profile in WRITE_PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "content.db")
+            shutil.copyfile(TEMPLATE_DB_PATH, path)
+
+            elapsed = bulk_import(path, profile, args.rows, args.chunk_size)
+            writes, reads, worst = concurrency(path, profile, args.seconds)
+            print(
+                f"{profile:<12} {args.rows / elapsed:14,.0f} {writes / args.seconds:10,.0f} "
+                f"{reads / args.seconds:10,.0f} {worst * 1000:9.1f}ms"
+            )
+
+if __name__ == "__main__":
+    main()
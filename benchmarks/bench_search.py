@@ -0,0 +1,51 @@
+import argparse
+import os
+import re
+import tempfile
+import time
+from benchmarks.synthetic import make_database
+from sql.entry import DataEntry
+
+"""
+Compares `DataEntry.search` against reading every content row and scanning its name and description.
+Run from the repository root: `python -m benchmarks.bench_search --rows 100000`
+"""
+
+QUERIES = ("item 4242", "usable number 99999", "equip 12", "synthetic 7")
+
+def naive_search(entry: DataEntry, text: str, limit: int) -> list:
+    words = [word.lower() for word in re.findall(r"\w+", text)]
+    found = []
+    for table in ('item', 'usable', 'equip'):
+        for row in entry.read(table):
+            haystack = re.findall(r"\w+", f"{row[2]} {row[3]}".lower())
+            if all(any(token.startswith(word) for token in haystack) for word in words):
+                found.append((table, row))
+    return found[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows per content table")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_database(os.path.join(directory, "content.db"), args.rows)
+        with DataEntry(path) as entry:
+            start = time.perf_counter()
+            entry.migrate()
+            print(f"{args.rows} rows per table, index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+            for text in QUERIES:
+                start = time.perf_counter()
+                indexed = entry.search(text, limit=args.limit)
+                fts = time.perf_counter() - start
+
+                start = time.perf_counter()
+                naive_search(entry, text, args.limit)
+                naive = time.perf_counter() - start
+
+                print(f"{text!r:24} fts {fts * 1000:8.2f} ms   scan {naive * 1000:9.1f} ms   {len(indexed)} hits")
+
+if __name__ == "__main__":
+    main()
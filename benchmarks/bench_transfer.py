@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import resource
+import shutil
+import tempfile
+from benchmarks.synthetic import TEMPLATE_DB_PATH, equip_row
+from sql.entry import DataEntry
+from sql.transfer import export_rows, import_rows, report
+
+"""
+Imports and re-exports a synthetic JSONL file through sql.transfer, reporting throughput and peak memory.
+Run from the repository root: `python -m benchmarks.bench_transfer --rows 1000000`
+"""
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--profile", default="bulk-import")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "equip.jsonl")
+        with open(source, "w", encoding="utf-8") as file:
+            for i in range(args.rows):
+                file.write(json.dumps(equip_row(i)) + "\n")
+        print(f"source: {os.path.getsize(source) / 2**20:.0f} MiB, peak RSS {peak_rss_mb():.0f} MiB")
+
+        path = os.path.join(directory, "content.db")
+        shutil.copyfile(TEMPLATE_DB_PATH, path)
+        with DataEntry(path, profile=args.profile) as entry:
+            with open(source, encoding="utf-8") as file:
+                stats = import_rows(entry, 'equip', file, "jsonl", args.chunk_size, report)
+            print("import: ", end="")
+            report(stats)
+            print(f"peak RSS after import: {peak_rss_mb():.0f} MiB")
+
+            with open(os.path.join(directory, "equip.csv"), "w", newline="", encoding="utf-8") as file:
+                stats = export_rows(entry, 'equip', file, "csv", args.chunk_size, report)
+            print("export: ", end="")
+            report(stats)
+            print(f"peak RSS after export: {peak_rss_mb():.0f} MiB")
+
+if __name__ == "__main__":
+    main()
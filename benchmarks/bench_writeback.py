@@ -0,0 +1,47 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from benchmarks.synthetic import item_row, make_database
+from sql.entry import DataEntry
+from sql.writeback import WriteBehindPolicy
+
+"""
+Compares the cost of `DataEntry.update` to its caller with and without the write-behind queue.
+Updates hit a small set of hot rows, as with an editor autosave, so the queue can coalesce them.
+Run from the repository root: `python -m benchmarks.bench_writeback --updates 5000`
+"""
+
+def run(path: str, updates: list[int], profile: str, policy=None) -> tuple[float, float]:
+    with DataEntry(path, profile=profile, write_behind=policy) as entry:
+        start = time.perf_counter()
+        for n, i in enumerate(updates):
+            entry.update('item', f"item_{i}", {**item_row(i), 'name': f"Item {i} v{n}"})
+        submitted = time.perf_counter() - start
+        entry.database.flush()
+        total = time.perf_counter() - start
+        if policy is not None:
+            stats = entry.database.writer.stats()
+            print(f"  {stats.written} rows written in {stats.flushes} batches, {stats.coalesced} coalesced, "
+                  f"mean flush {stats.mean_flush_time * 1000:.2f} ms")
+    return submitted, total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--hot-rows", type=int, default=200)
+    parser.add_argument("--profile", default="default")
+    args = parser.parse_args()
+
+    updates = [random.randrange(args.hot_rows) for _ in range(args.updates)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_database(os.path.join(directory, "content.db"), args.hot_rows)
+
+        for name, policy in (("synchronous", None), ("write-behind", WriteBehindPolicy())):
+            print(name)
+            submitted, total = run(path, updates, args.profile, policy)
+            print(f"  caller {submitted / args.updates * 1e6:8.1f} us/update   until durable {total * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import shutil
+from sql.entry import DataEntry
+
+"""
+Helpers for building synthetic content databases to benchmark against.
+"""
+
+TEMPLATE_DB_PATH = "sql/object_init.db"
+
+def item_row(i: int) -> dict:
+    return {'id': f"item_{i}", 'name': f"Item {i}", 'desc': f"Synthetic item number {i}"}
+
+def usable_row(i: int) -> dict:
+    return {
+        'id': f"usable_{i}", 'name': f"Usable {i}", 'desc': f"Synthetic usable number {i}",
+        'use_type': ("heal", "buff", "damage")[i % 3], 'use_param': f"amount={i % 100}"
+    }
+
+def equip_row(i: int) -> dict:
+    return {
+        'id': f"equip_{i}", 'name': f"Equip {i}", 'desc': f"Synthetic equip number {i}",
+        'element': ("fire", "water", "earth", "air")[i % 4], 'attribute': f"str={i % 20:+d}",
+        'skill': "", 'is_dual_wield': i % 2
+    }
+
+def make_database(path: str, rows: int) -> str:
+    """
+    Copies the empty content database to `path` and fills every content table with `rows` rows
+    """
+    shutil.copyfile(TEMPLATE_DB_PATH, path)
+    with DataEntry(path) as entry:
+        entry.add_many('item', (item_row(i) for i in range(rows)))
+        entry.add_many('usable', (usable_row(i) for i in range(rows)))
+        entry.add_many('equip', (equip_row(i) for i in range(rows)))
+    return path
@@ -0,0 +1,162 @@
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional
+from classes.data.attributes import AttributeModifier
+
+"""
+Contains the canonical text encodings
+of content columns and their parsers:
+
+`equip.attribute`  -> "str=+5;spd=-2" or "str=+10%;lck=+5%"
+`equip.skill`      -> "slash,parry"
+`usable.use_param` -> "amount=50;target=self"
+
+Parsed results are memoized per distinct string,
+so content sharing the same text parses it once.
+"""
+
+# Attribute keys in canonical order, matching the STR/DEF/INT/WIL/DEX/ACC/SPD/LCK display order
+ATTRIBUTE_KEYS: tuple[str, ...] = ("str", "def", "int", "wil", "dex", "acc", "spd", "lck")
+
+Parameter = int | float | str
+
+def parse_attribute(text: Optional[str]) -> Optional[AttributeModifier]:
+    """
+    Parses an `equip.attribute` string into a new AttributeModifier.
+    Values are signed integers, or percentages for a fractional modifier; omitted attributes are 0.
+    Returns None for an empty or missing string.
+    """
+    parsed = _parse_attribute(text or "")
+    if parsed is None:
+        return None
+    values, frac = parsed
+    return AttributeModifier(*values, frac=frac)
+
+@lru_cache(maxsize=4096)
+def _parse_attribute(text: str) -> Optional[tuple[tuple[int | float, ...], bool]]:
+    # AttributeModifier is mutable, so only its immutable arguments are memoized
+    if text.strip() == "":
+        return None
+
+    values: list[int | float] = [0] * len(ATTRIBUTE_KEYS)
+    seen: set[int] = set()
+    frac: Optional[bool] = None
+    for entry in text.split(";"):
+        key, sep, value = entry.partition("=")
+        key, value = key.strip().lower(), value.strip()
+        if not sep or key not in ATTRIBUTE_KEYS:
+            raise ValueError(f"Invalid attribute entry {entry!r} in {text!r}")
+
+        index = ATTRIBUTE_KEYS.index(key)
+        if index in seen:
+            raise ValueError(f"Duplicate attribute {key!r} in {text!r}")
+        seen.add(index)
+
+        percent = value.endswith("%")
+        if frac is not None and frac != percent:
+            raise ValueError(f"Cannot mix flat and percentage attributes in {text!r}")
+        frac = percent
+
+        try:
+            values[index] = float(value[:-1]) / 100 if percent else int(value)
+        except ValueError:
+            raise ValueError(f"Invalid attribute value {value!r} in {text!r}") from None
+
+    return tuple(values), bool(frac)
+
+def encode_attribute(modifier: Optional[AttributeModifier]) -> str:
+    """
+    Canonical `equip.attribute` string of `modifier`, listing its non-zero attributes in canonical order
+    """
+    if modifier is None:
+        return ""
+
+    values = (
+        modifier.strength, modifier.defense, modifier.intellect, modifier.willpower,
+        modifier.dexterity, modifier.accuracy, modifier.speed, modifier.luck
+    )
+    if modifier.isfractional:
+        entries = [f"{key}={_percent(value)}%" for key, value in zip(ATTRIBUTE_KEYS, values) if value]
+    else:
+        entries = [f"{key}={value:+d}" for key, value in zip(ATTRIBUTE_KEYS, values) if value]
+    return ";".join(entries)
+
+def _percent(value: float) -> str:
+    # Shortest signed percentage that parses back to exactly `value`; 17 significant digits always do
+    for digits in range(1, 18):
+        text = f"{value * 100:+.{digits}g}"
+        if float(text) / 100 == value:
+            return text
+    return f"{value * 100:+.17g}"
+
+@lru_cache(maxsize=4096)
+def parse_skills(text: Optional[str]) -> tuple[str, ...]:
+    """
+    Parses an `equip.skill` string into its skill ids, in order
+    """
+    if text is None or text.strip() == "":
+        return ()
+
+    skills = tuple(skill.strip() for skill in text.split(","))
+    if "" in skills:
+        raise ValueError(f"Empty skill id in {text!r}")
+    return skills
+
+def encode_skills(skills: Iterable[str]) -> str:
+    """
+    Canonical `equip.skill` string of `skills`
+    """
+    skills = list(skills)
+    for skill in skills:
+        if skill != skill.strip() or skill == "" or "," in skill:
+            raise ValueError(f"Invalid skill id {skill!r}")
+    return ",".join(skills)
+
+def _parse_value(value: str) -> Parameter:
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+@lru_cache(maxsize=4096)
+def parse_params(text: Optional[str]) -> tuple[tuple[str, Parameter], ...]:
+    """
+    Parses a `usable.use_param` string into (name, value) pairs, in order.
+    Values that read as numbers become int or float; everything else stays a str.
+    The pairs can be passed on to an item effect with `**dict(pairs)`.
+    """
+    if text is None or text.strip() == "":
+        return ()
+
+    params: list[tuple[str, Parameter]] = []
+    seen: set[str] = set()
+    for entry in text.split(";"):
+        name, sep, value = entry.partition("=")
+        name = name.strip()
+        if not sep or not name.isidentifier():
+            raise ValueError(f"Invalid parameter entry {entry!r} in {text!r}")
+        if name in seen:
+            raise ValueError(f"Duplicate parameter {name!r} in {text!r}")
+        seen.add(name)
+        params.append((name, _parse_value(value.strip())))
+    return tuple(params)
+
+def encode_params(params: Mapping[str, Parameter] | Iterable[tuple[str, Parameter]]) -> str:
+    """
+    Canonical `usable.use_param` string of `params`.
+    Text values must not contain `;`, nor read as a number, so that they parse back unchanged.
+    """
+    pairs = params.items() if isinstance(params, Mapping) else params
+    entries = []
+    for name, value in pairs:
+        if not name.isidentifier():
+            raise ValueError(f"Invalid parameter name {name!r}")
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise TypeError(f"Parameter {name!r} must be int, float or str, got {type(value).__name__}")
+        if isinstance(value, str) and (";" in value or value != value.strip() or _parse_value(value) != value):
+            raise ValueError(f"Parameter {name!r} has a value that would not parse back: {value!r}")
+        entries.append(f"{name}={value!r}" if isinstance(value, float) else f"{name}={value}")
+    return ";".join(entries)
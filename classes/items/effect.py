@@ -3,6 +3,24 @@ from typing import Optional
 from abc import ABC, abstractmethod
 
 class ItemEffect(ABC):
+    """
+    Effect applied by using an item. `target` is positional-only, so a parameter may share its name.
+    """
     @abstractmethod
-    def __call__(self, target, **parameters):
+    def __call__(self, target, /, **parameters):
         pass
+
+# Item effects bound to the `use_type` of usable content, see `register_effect`
+_EFFECTS: dict[str, ItemEffect] = {}
+
+def register_effect(use_type: str, effect: ItemEffect) -> None:
+    """
+    Binds `effect` to every usable whose `use_type` is `use_type`, replacing any effect bound before
+    """
+    _EFFECTS[use_type] = effect
+
+def effect_for(use_type: Optional[str]) -> Optional[ItemEffect]:
+    """
+    Returns the item effect bound to `use_type`, or None
+    """
+    return None if use_type is None else _EFFECTS.get(use_type)
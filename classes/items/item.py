@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from typing import Optional
 from abc import ABC, abstractmethod
 from classes.items.effect import *
+from classes.data.attributes import AttributeModifier
+from classes.data.encoding import Parameter, parse_attribute, parse_params, parse_skills
 
 """
 Contains classes related to 
@@ -16,19 +18,53 @@ class Item:
 class ItemCreator:
     pass
 
+@dataclass
 class Usable(Item, ABC):
-    def __init__(self, metadata: Metadata):
-        super().__init__(metadata)
-        #item_effect: ItemEffect
-        #effect_parameter: Tuple[Any]
-        pass
+    use_type: Optional[str] = None
+    use_param: Optional[str] = None
+    #item_effect: ItemEffect
+
+    @property
+    def effect_parameter(self) -> tuple[tuple[str, Parameter], ...]:
+        """
+        Parameters of the item effect, parsed from `use_param` (see classes.data.encoding)
+        """
+        return parse_params(self.use_param)
 
     @abstractmethod
     def use(self):
         pass
 
+@dataclass
+class GenericUsable(Usable):
+    """
+    Usable built straight from its content definition.
+    Using it applies the item effect registered for its `use_type` (see `register_effect`)
+    with the parameters parsed from `use_param`.
+    """
+    def use(self, target):
+        effect = effect_for(self.use_type)
+        if effect is None:
+            raise LookupError(f"No item effect registered for use type {self.use_type!r}")
+        return effect(target, **dict(self.effect_parameter))
+
+@dataclass
 class Equippable(Item, ABC):
-    def __init__(self, Metadata):
-        #attr_mod: Attribute
-        #skill_set: List[Skill]
-        pass
+    element: Optional[str] = None
+    attribute: Optional[str] = None
+    skill: Optional[str] = None
+    dual_wield: bool = False
+
+    @property
+    def attr_mod(self) -> Optional[AttributeModifier]:
+        """
+        Attribute modifier parsed from `attribute` (see classes.data.encoding); a new object on every access
+        """
+        return parse_attribute(self.attribute)
+
+    @property
+    def skill_set(self) -> tuple[str, ...]:
+        """
+        Skill ids parsed from `skill` (see classes.data.encoding)
+        """
+        return parse_skills(self.skill)
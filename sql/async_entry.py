@@ -0,0 +1,101 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, Mapping, Optional, Self
+from sql.entry import BatchResult, DataEntry, FetchResult
+
+"""
+Module that contains the asyncio front-end for data entry.
+"""
+
+class AsyncDataEntry:
+    """
+    Coroutine mirror of `DataEntry` for use from an asyncio event loop.
+    Requests run on dedicated database threads: reads are spread over `readers` threads so they can overlap,
+    while writes go through a single writer thread so they are applied one at a time, in submission order.
+    At most `max_pending` requests are handed to the threads at once; further requests wait on the event loop.
+    """
+    def __init__(
+            self,
+            path: Optional[str] = None,
+            readers: int = 4,
+            max_pending: int = 64
+        ):
+        if readers < 1 or max_pending < 1:
+            raise ValueError(f"readers and max_pending must be positive, got {readers} and {max_pending}")
+
+        self.entry = DataEntry(path)
+        self._readers = ThreadPoolExecutor(readers, thread_name_prefix="db-read")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="db-write")
+        self._pending = asyncio.Semaphore(max_pending)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Waits for queued requests to finish, then releases the database threads and connections
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._shutdown)
+
+    def _shutdown(self) -> None:
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        self.entry.close()
+
+    async def _run(self, executor: ThreadPoolExecutor, func: Callable[..., Any], *args: Any) -> Any:
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, partial(func, *args))
+
+    async def get(self, table: str, key: str) -> Any:
+        return await self._run(self._readers, self.entry.get, table, key)
+
+    async def get_many(self, table: str, keys: Iterable[str]) -> FetchResult:
+        return await self._run(self._readers, self.entry.get_many, table, list(keys))
+
+    async def read(self, table: str) -> list[Any]:
+        return await self._run(self._readers, self.entry.read, table)
+
+    async def query_table_list(self) -> list[tuple[str]]:
+        return await self._run(self._readers, self.entry.query_table_list)
+
+    async def query_table_schema(self, table: str) -> list[tuple[str, str]]:
+        return await self._run(self._readers, self.entry.query_table_schema, table)
+
+    async def add(self, table: str, values: dict[str, Any]) -> None:
+        await self._run(self._writer, self.entry.add, table, values)
+
+    async def update(self, table: str, ref_id: str, values: dict[str, Any]) -> None:
+        await self._run(self._writer, self.entry.update, table, ref_id, values)
+
+    async def upsert(self, table: str, values: dict[str, Any]) -> None:
+        await self._run(self._writer, self.entry.upsert, table, values)
+
+    async def add_many(
+            self,
+            table: str,
+            rows: Iterable[dict[str, Any]],
+            chunk_size: int = 1000
+        ) -> BatchResult:
+        return await self._run(self._writer, self.entry.add_many, table, rows, chunk_size)
+
+    async def upsert_many(
+            self,
+            table: str,
+            rows: Iterable[dict[str, Any]],
+            chunk_size: int = 1000
+        ) -> BatchResult:
+        return await self._run(self._writer, self.entry.upsert_many, table, rows, chunk_size)
+
+    async def update_many(
+            self,
+            table: str,
+            rows: Mapping[str, dict[str, Any]] | Iterable[tuple[str, dict[str, Any]]],
+            chunk_size: int = 1000
+        ) -> BatchResult:
+        return await self._run(self._writer, self.entry.update_many, table, rows, chunk_size)
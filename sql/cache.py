@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+"""
+Module that contains in-memory caches for database reads.
+"""
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Snapshot of a cache's counters
+    """
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class LRUCache:
+    """
+    Thread-safe, bounded, least recently used cache.
+    Every invalidation bumps a token; a value read from the database is only stored if no invalidation
+    happened since its token was taken, so a write racing with a read can never leave a stale entry behind.
+    """
+    MISSING = object()
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self._capacity = capacity
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._token = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._data), self._capacity)
+
+    def token(self) -> int:
+        """
+        Returns the current invalidation token, to be passed to `put`
+        """
+        return self._token
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Returns the cached value for `key`, or `LRUCache.MISSING`
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return self.MISSING
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, token: int) -> bool:
+        """
+        Stores `value` unless the cache was invalidated after `token` was taken.
+        Returns whether the value was stored.
+        """
+        with self._lock:
+            if token != self._token:
+                return False
+
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._capacity:
+                self._data.popitem(last=False)
+                self._evictions += 1
+            return True
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            self._token += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._token += 1
+            self._data.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
@@ -0,0 +1,204 @@
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Literal, Mapping, Optional
+from sql.interface import SQLInterface
+from sql.lookup import lookup, LookupKey
+
+"""
+Module that contains per-database caches of schema information.
+"""
+
+class SchemaError(Exception):
+    """
+    Raises when data does not fit the provided schema
+    """
+    pass
+
+# Request keys that differ from the name of the column they fill
+KEY_ALIASES: Mapping[str, str] = MappingProxyType({
+    'ref_id': 'id',
+    'dual_wield': 'is_dual_wield'
+})
+
+def _accepted_types(declared: str) -> Optional[tuple[type, ...]]:
+    """
+    Python types accepted for a column, following SQLite's type affinity rules.
+    None accepts any value.
+    """
+    declared = declared.upper()
+    if "INT" in declared:
+        return (int,)
+    if "CHAR" in declared or "CLOB" in declared or "TEXT" in declared:
+        return (str,)
+    if declared == "" or "BLOB" in declared:
+        return None
+    return (int, float)
+
+@dataclass(frozen=True)
+class TableSchema:
+    """
+    Introspected layout of a single table.
+    `keys` maps every request key accepted by `add`/`update` to the column it fills;
+    the auto-incrementing row id is assigned by the database and takes no key.
+    """
+    table: str
+    columns: tuple[str, ...]
+    keys: Mapping[str, str]
+    checks: tuple[tuple[str, Optional[tuple[type, ...]], bool], ...]
+
+    @classmethod
+    def from_table_info(cls, table: str, info: list[tuple[str, str, int, int]]) -> "TableSchema":
+        """
+        Builds the schema from `PRAGMA table_info` rows of (name, type, notnull, pk)
+        """
+        rowid_alias = len([row for row in info if row[3] > 0]) == 1
+        keys: dict[str, str] = {}
+        checks: list[tuple[str, Optional[tuple[type, ...]], bool]] = []
+        for name, declared, notnull, pk in info:
+            if rowid_alias and pk > 0 and declared.upper() == "INTEGER":
+                continue
+            key = KEY_ALIASES.get(name, name)
+            keys[key] = name
+            checks.append((key, _accepted_types(declared), not notnull))
+
+        return cls(table, tuple(row[0] for row in info), MappingProxyType(keys), tuple(checks))
+
+    def write_request(self, key: LookupKey) -> str:
+        """
+        Builds the `SQL_CREATE`, `SQL_UPDATE` or `SQL_UPSERT` statement binding every key of this schema
+        """
+        columns = ", ".join(f'"{column}"' for column in self.keys.values())
+        params = ", ".join(f":{name}" for name in self.keys)
+        if key == LookupKey.SQL_CREATE:
+            return f'INSERT INTO "{self.table}" ({columns}) VALUES ({params});'
+        if key == LookupKey.SQL_UPDATE:
+            assignments = ", ".join(f'"{column}" = :{name}' for name, column in self.keys.items())
+            return f'UPDATE "{self.table}" SET {assignments} WHERE ref_id = :old_id;'
+        if key == LookupKey.SQL_UPSERT:
+            assignments = ", ".join(f'"{column}" = excluded."{column}"' for column in self.keys.values() if column != "ref_id")
+            return f'INSERT INTO "{self.table}" ({columns}) VALUES ({params}) ON CONFLICT (ref_id) DO UPDATE SET {assignments};'
+        raise ValueError(f"{key} is not a write request")
+
+    def problems(self, values: Mapping[str, Any]) -> list[str]:
+        """
+        Lists every way `values` does not fit this schema; empty when it fits
+        """
+        if values.keys() != self.keys.keys():
+            return [f"expected keys {sorted(self.keys)}, got {sorted(values)}"]
+
+        found = []
+        for key, types, nullable in self.checks:
+            value = values[key]
+            if value is None:
+                if not nullable:
+                    found.append(f"{key} cannot be NULL")
+            elif types is not None and not isinstance(value, types):
+                found.append(f"{key} expects {' or '.join(t.__name__ for t in types)}, got {type(value).__name__}")
+        return found
+
+class TableCatalog:
+    """
+    Cached list of tables for a single database, along with their introspected schemas.
+    Table checks are answered from memory; the catalog is reloaded only when a table is missing
+    and `PRAGMA schema_version` shows that the schema changed since the last load.
+    """
+    def __init__(self, database: SQLInterface):
+        self.database = database
+
+        # Version and tables are swapped together so concurrent readers never see a mismatched pair
+        self._state: tuple[Optional[int], frozenset[str]] = (None, frozenset())
+        self._schemas: dict[str, TableSchema] = {}
+        self._write_requests: dict[tuple[LookupKey, str], str] = {}
+
+    def __contains__(self, table: str) -> bool:
+        if table in self._state[1]:
+            return True
+
+        # Only revalidate on a miss, so repeated hits never touch the database
+        self.refresh()
+        return table in self._state[1]
+
+    @property
+    def tables(self) -> frozenset[str]:
+        if self._state[0] is None:
+            self.refresh()
+        return self._state[1]
+
+    def schema_version(self) -> int:
+        return self.database.db_query("PRAGMA schema_version;")[0][0]
+
+    def invalidate(self) -> None:
+        """
+        Forces the next lookup to reload the table list
+        """
+        self._state = (None, self._state[1])
+        self._schemas = {}
+        self._write_requests = {}
+
+    def refresh(self) -> bool:
+        """
+        Reloads the table list if the schema changed, dropping every cached table schema.
+        Returns whether a reload happened.
+        """
+        version = self.schema_version()
+        if version == self._state[0]:
+            return False
+
+        request = lookup(LookupKey.SQL_TABLE_LIST)
+        self._state = (version, frozenset(row[0] for row in self.database.db_query(request)))
+        self._schemas = {}
+        self._write_requests = {}
+        return True
+
+    def schema(self, table: str) -> TableSchema:
+        """
+        Returns the schema of `table`, introspected once per schema version
+        """
+        self.verify(table)
+        schema = self._schemas.get(table)
+        if schema is None:
+            request = lookup(LookupKey.SQL_TABLE_INFO, table, self)
+            schema = TableSchema.from_table_info(table, self.database.db_query(request))
+            self._schemas[table] = schema
+        return schema
+
+    def write_request(self, key: LookupKey, table: str) -> str:
+        """
+        Returns the write statement of `key` for `table`: the one in sql.lookup while it binds exactly
+        the keys of the table's schema, otherwise one built from the schema, so added columns are written too
+        """
+        request = self._write_requests.get((key, table))
+        if request is None:
+            schema = self.schema(table)
+            request = lookup(key, table, self)
+            if set(re.findall(r":(\w+)", request)) - {'old_id'} != set(schema.keys):
+                request = schema.write_request(key)
+            self._write_requests[(key, table)] = request
+        return request
+
+    def columns(self, table: str) -> tuple[str, ...]:
+        """
+        Returns the column names of `table` in declaration order
+        """
+        return self.schema(table).columns
+
+    def verify(self, table: str) -> Literal[True]:
+        """
+        Verify whether the table exists inside this catalog's database.
+        """
+        if table in self:
+            return True
+        raise ValueError(f"{table} not in list of accepted tables")
+
+    def verify_values(self, table: str, values: Mapping[str, Any]) -> Literal[True]:
+        """
+        Verify whether `values` fits the schema of `table`.
+        A mismatch is rechecked once against a reloaded schema, in case the table changed since it was cached.
+        """
+        problems = self.schema(table).problems(values)
+        if problems and self.refresh():
+            problems = self.schema(table).problems(values)
+        if problems:
+            raise SchemaError(f"{values} does not fit the schema of {table}: {'; '.join(problems)}")
+        return True
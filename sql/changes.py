@@ -0,0 +1,119 @@
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional, Self
+from sql.interface import SQLInterface
+from sql.migrations import MigrationError
+
+"""
+Module that reports which content rows were written since it last looked, for hot reloading.
+Rows are recorded in `content_changes` by the triggers of schema version 3 (see sql.migrations).
+"""
+
+@dataclass(frozen=True)
+class Changes:
+    """
+    Content rows written since the previous poll, as table -> `ref_id`s.
+    A changed `ref_id` may have been added, updated, renamed away or deleted; reloading it tells which.
+    `complete` is False when part of the changelog was pruned before it was seen, so a full reload is needed.
+    """
+    rows: Mapping[str, frozenset[str]] = field(default_factory=lambda: MappingProxyType({}))
+    complete: bool = True
+
+    def __bool__(self) -> bool:
+        return len(self.rows) > 0 or not self.complete
+
+class ChangeWatcher:
+    """
+    Polls a database for content changes made through any other connection or process.
+    Each poll first checks `PRAGMA data_version` on a connection of its own, which only moves when
+    another connection commits, so an idle poll costs one pragma and never touches the changelog.
+    """
+    def __init__(self, database: SQLInterface):
+        self.database = database
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._data_version: Optional[int] = None
+        self._cursor = 0
+
+        # Only changes made after the watcher was created are reported
+        try:
+            self.position()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = self.database.connect(readonly=True)
+        return self._conn
+
+    def position(self) -> int:
+        """
+        Moves the watcher to the end of the changelog, skipping any unseen change.
+        Returns the id of the latest change.
+        """
+        with self._lock:
+            conn = self._connection()
+            self._data_version = conn.execute("PRAGMA data_version;").fetchone()[0]
+            try:
+                conn.execute("SELECT 1 FROM content_changes LIMIT 1;")
+            except sqlite3.OperationalError as e:
+                raise MigrationError("Database has no content changelog; migrate it to schema version 3") from e
+
+            # The autoincrement sequence still knows the latest id after the changelog was pruned empty
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'content_changes';").fetchone()
+            self._cursor = 0 if row is None else row[0]
+            return self._cursor
+
+    def poll(self) -> Changes:
+        """
+        Returns the content rows written since the previous poll
+        """
+        with self._lock:
+            conn = self._connection()
+            version = conn.execute("PRAGMA data_version;").fetchone()[0]
+            if version == self._data_version:
+                return Changes()
+            self._data_version = version
+
+            # One read transaction, so the pruning check and the changes see the same changelog
+            with conn:
+                conn.execute("BEGIN;")
+                oldest = conn.execute("SELECT min(change_id) FROM content_changes;").fetchone()[0]
+                row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'content_changes';").fetchone()
+                latest = 0 if row is None else row[0]
+                changes = conn.execute(
+                    "SELECT change_id, table_name, ref_id FROM content_changes WHERE change_id > :cursor ORDER BY change_id;",
+                    {'cursor': self._cursor}
+                ).fetchall()
+
+            # An empty changelog is only complete if nothing was recorded since the cursor, as it may have been pruned empty
+            complete = latest == self._cursor or (oldest is not None and oldest <= self._cursor + 1)
+            self._cursor = latest
+
+        rows: dict[str, set[str]] = {}
+        for _, table, ref_id in changes:
+            rows.setdefault(table, set()).add(ref_id)
+        return Changes(MappingProxyType({table: frozenset(ref_ids) for table, ref_ids in rows.items()}), complete)
+
+def prune(database: SQLInterface, upto: int) -> int:
+    """
+    Deletes changelog entries up to and including change `upto`, which every watcher should have seen.
+    Returns the number of entries deleted.
+    """
+    with database.transaction() as conn:
+        return conn.execute("DELETE FROM content_changes WHERE change_id <= :upto;", {'upto': upto}).rowcount
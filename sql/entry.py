@@ -1,29 +1,168 @@
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
 from sql.interface import SQLInterface
-from typing import Any, Optional, Literal
+from typing import Any, Iterable, Iterator, Mapping, Optional, Literal, Self
 from sql.lookup import lookup, LookupKey
+from sql.catalog import SchemaError, TableCatalog
+from sql.cache import LRUCache
+from sql.migrations import MigrationError, migrate
+from sql.rows import ROW_BUILDERS, RowDecoder
 
 """
 Module that contains all classes involved in data entry and database manipulation.
 """
 
-class SchemaError(Exception):
+@dataclass
+class BatchResult:
     """
-    Raises when data does not fit the provided schema
+    Outcome of a bulk write.
+    `failures` holds the input position, the row, and the error of every row that was not written.
     """
-    pass
+    written: int = 0
+    failures: list[tuple[int, Any, Exception]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return len(self.failures) == 0
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of a multi-key read.
+    `rows` maps every key that was found to its row; `missing` lists the keys that were not, in request order.
+    """
+    rows: dict[str, Any] = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+
+_Comparisons: dict[str, str] = {
+    'eq': "=",
+    'ne': "!=",
+    'lt': "<",
+    'le': "<=",
+    'gt': ">",
+    'ge': ">="
+}
+
+def _compile_predicate(
+        column: str,
+        operator: str,
+        value: Any,
+        name: str,
+        params: dict[str, Any]
+    ) -> str:
+    """
+    Compiles a single `find` filter into SQL, adding its bound values to `params`
+    """
+    if operator in ('eq', 'ne') and value is None:
+        return f"{column} IS NULL" if operator == 'eq' else f"{column} IS NOT NULL"
+
+    if operator in _Comparisons:
+        params[name] = value
+        return f"{column} {_Comparisons[operator]} :{name}"
+
+    if operator == 'in':
+        if isinstance(value, (str, bytes)):
+            raise ValueError(f"`in` filters need a collection of values, got {value!r}")
+        placeholders = []
+        for i, item in enumerate(value):
+            params[f"{name}_{i}"] = item
+            placeholders.append(f":{name}_{i}")
+        return f"{column} IN ({', '.join(placeholders)})"
+
+    if operator == 'startswith':
+        if not isinstance(value, str):
+            raise ValueError(f"`startswith` filters need a str, got {value!r}")
+
+        # A range over the prefix, unlike LIKE, is case-sensitive and can be answered by an index
+        params[name] = value
+        upper = value.rstrip(chr(0x10FFFF))
+        if upper == "":
+            return f"substr({column}, 1, {len(value)}) = :{name}"
+        params[f"{name}_end"] = upper[:-1] + chr(ord(upper[-1]) + 1)
+        return f"{column} >= :{name} AND {column} < :{name}_end"
+
+    raise ValueError(f"Unknown filter operator: {operator}")
+
+def _verify_limit(limit: Any) -> Literal[True]:
+    if not isinstance(limit, int) or limit < 0:
+        raise ValueError(f"limit must be a non-negative int, got {limit!r}")
+    return True
+
+def _search_query(text: str) -> str:
+    """
+    Turns free text into an FTS5 query matching rows that contain every word, or a word starting with it.
+    Quoting each word keeps FTS5 operators and punctuation in `text` from being parsed as query syntax.
+    """
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
 
 class DataEntry:
     """
     Class that serves as the data model/interface for the DataEntry GUI app in `gui/`
+    `cache_size` enables a read-through cache of that many rows in front of `get`; writes made through this entry keep it current.
+    Any other keyword options are passed on to the underlying `SQLInterface`.
     """
-    def __init__(self, path: Optional[str] = None):
-        self.database = SQLInterface(path)
+    def __init__(self, path: Optional[str] = None, cache_size: int = 0, **options: Any):
+        self.database = SQLInterface(path, **options)
+        self.catalog = TableCatalog(self.database)
+        self.cache: Optional[LRUCache] = LRUCache(cache_size) if cache_size > 0 else None
+
+        # Cache keys written inside the calling thread's open transaction
+        self._touched = threading.local()
+        self._decoders: dict[str, RowDecoder] = {}
+
+        # Queued writes are invalidated again once committed, in case a read cached the old row in the meantime
+        self._write_tables: dict[str, str] = {}
+        if self.cache is not None and self.database.writer is not None:
+            self.database.writer.subscribe(self._committed)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Releases every connection held by the underlying database interface
+        """
+        self.database.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Self]:
+        """
+        Unit of work: every `add`/`update` made by this thread inside the block shares one connection
+        and one `BEGIN IMMEDIATE` transaction, committed once on exit and rolled back on an exception.
+        Blocks can be nested; inner blocks become savepoints.
+        """
+        try:
+            with self.database.transaction():
+                yield self
+        finally:
+            # Other threads may have cached the committed copy of a touched row while the block was open
+            if self.cache is not None:
+                self.cache.invalidate(*getattr(self._touched, "keys", ()))
+                if not self.database.in_transaction:
+                    self._touched.keys = set()
+
+    def migrate(self, target: Optional[int] = None) -> list[int]:
+        """
+        Brings the database schema up to `target` (defaults to the latest version) through sql.migrations
+        Returns the versions that were applied.
+        """
+        applied = migrate(self.database, target)
+        self.catalog.invalidate()
+        return applied
 
     def request(self, key: LookupKey | str, table: str = "") -> str:
         """
         Responsible for looking up requests inside sql.lookup
         """ 
-        request = lookup(key, table)
+        request = lookup(key, table, self.catalog)
         if not isinstance(request, str):
             raise ValueError(f"Invalid request format: required str, got {type(request)}")
         return request
@@ -35,34 +174,102 @@ class DataEntry:
         ) -> Literal[True]:
         """
         Verifies schema for data creation and updates
+        Keys and value types are checked against the table's introspected schema (see `TableCatalog.schema`).
         """
-        
-        # Verify if keys are equal in size
-        dict_keys = {key for key in values.keys()}
-        required_schema = lookup(LookupKey.TABLE_SCHEMA, table)
-        if required_schema != dict_keys:
-            raise SchemaError(f"{values} does not fit the required schema: {required_schema}")
-        
-        return True
+        return self.catalog.verify_values(table, values)
+
+    def _shared_cache(self) -> Optional[LRUCache]:
+        # Inside a transaction, reads may see this thread's uncommitted writes, which must neither be shared
+        # with other threads nor hidden behind a committed copy
+        return None if self.database.in_transaction else self.cache
 
     def get(
             self, 
             table: str, 
-            key: str
+            key: str,
+            decode: bool = False
         ) -> Any:
         """
         Retrieves a single item from the database
+        `decode` returns the row as its game object (see sql.rows) instead of a tuple.
         """
 
         request = self.request(LookupKey.SQL_GET, table)
 
+        cache = self._shared_cache()
+        if cache is not None:
+            cached = cache.get((table, key))
+            if cached is not LRUCache.MISSING:
+                return self._decode(table, cached) if decode else cached
+            token = cache.token()
+
         search_key = {'key': key}
         data = self.database.db_query(request, search_key)
+        row = None if len(data) == 0 else data[0]
+
+        if cache is not None:
+            cache.put((table, key), row, token)
+        return self._decode(table, row) if decode else row
+
+    def get_many(
+            self,
+            table: str,
+            keys: Iterable[str],
+            decode: bool = False
+        ) -> FetchResult:
+        """
+        Retrieves every row of a single table whose `ref_id` is in `keys`, in one query however many keys there are.
+        Duplicate keys are fetched once; keys with no row are listed in `missing`.
+        `decode` returns game objects instead of tuples.
+        """
+        request = self.request(LookupKey.SQL_GET_MANY, table)
+        keys = list(dict.fromkeys(keys))
+        result = FetchResult()
+
+        pending = keys
+        cache = self._shared_cache()
+        if cache is not None:
+            pending = []
+            for key in keys:
+                cached = cache.get((table, key))
+                if cached is LRUCache.MISSING:
+                    pending.append(key)
+                elif cached is not None:
+                    result.rows[key] = cached
+            token = cache.token()
+
+        if pending:
+            # The keys are bound as a single JSON array and joined through json_each, so the statement never changes
+            # and no temporary table is needed, even on read-only connections
+            ref_id = self.catalog.columns(table).index("ref_id")
+            for row in self.database.db_query(request, {'keys': json.dumps(pending)}):
+                result.rows[row[ref_id]] = row
+
+            if cache is not None:
+                for key in pending:
+                    cache.put((table, key), result.rows.get(key), token)
 
-        if len(data) == 0:
+        result.missing = [key for key in keys if key not in result.rows]
+        if decode:
+            result.rows = {key: self._decode(table, row) for key, row in result.rows.items()}
+        return result
+
+    def decoder(self, table: str) -> RowDecoder:
+        """
+        Returns the shared row decoder of a content table
+        """
+        decoder = self._decoders.get(table)
+        if decoder is None:
+            decoder = self._decoders[table] = RowDecoder(table)
+        return decoder
+
+    def _decode(self, table: str, row: Optional[tuple]) -> Any:
+        """
+        Decodes a full row of `table`, as returned by `SELECT *`
+        """
+        if row is None:
             return None
-        else:
-            return data[0]
+        return self.decoder(table).layout(self.catalog.columns(table))(row)
 
     def add(
             self, 
@@ -75,9 +282,11 @@ class DataEntry:
 
         self.verify_schema(table, values)
 
-        request = self.request(LookupKey.SQL_CREATE, table)
+        request = self.catalog.write_request(LookupKey.SQL_CREATE, table)
+        self._write_tables[request] = table
         self.database.db_modify(request, values)
-        
+        self._invalidate(table, values)
+
     def update(
             self, 
             table: str,
@@ -91,20 +300,399 @@ class DataEntry:
         self.verify_schema(table, values)
 
         values["old_id"] = ref_id
-        request = self.request(LookupKey.SQL_UPDATE, table)
-        self.database.db_modify(request, values)
+        request = self.catalog.write_request(LookupKey.SQL_UPDATE, table)
+        self._write_tables[request] = table
+
+        # Only updates that keep the ref_id can be coalesced; a later update of a renamed row's old id would find nothing
+        key = (table, ref_id) if values["id"] == ref_id else None
+        self.database.db_modify(request, values, key)
+        self._invalidate(table, values)
             
+    def upsert(
+            self,
+            table: str,
+            values: dict[str, Any]
+        ):
+        """
+        Adds a row inside the database, or updates the existing row with the same `ref_id`, in one statement.
+        Conflicts on any other unique column still fail.
+        """
+        self.verify_schema(table, values)
+
+        request = self.catalog.write_request(LookupKey.SQL_UPSERT, table)
+        self._write_tables[request] = table
+        self.database.db_modify(request, values, (table, values["id"]))
+        self._invalidate(table, values)
+
+    def add_many(
+            self,
+            table: str,
+            rows: Iterable[dict[str, Any]],
+            chunk_size: int = 1000
+        ) -> BatchResult:
+        """
+        Adds many rows inside the database.
+        Rows are written `chunk_size` at a time, one transaction per chunk.
+        Rows that fail schema validation or a constraint are reported in the result instead of aborting the batch.
+        """
+        request = self.catalog.write_request(LookupKey.SQL_CREATE, table)
+
+        result = BatchResult()
+        indexed = self._validated_rows(table, ((i, values, values) for i, values in enumerate(rows)), result)
+        self._write_chunks(table, request, indexed, chunk_size, result)
+        return result
+
+    def upsert_many(
+            self,
+            table: str,
+            rows: Iterable[dict[str, Any]],
+            chunk_size: int = 1000
+        ) -> BatchResult:
+        """
+        Adds or updates many rows inside the database, matching existing rows by `ref_id` as in `upsert`.
+        Chunking and failure reporting work as in `add_many`.
+        """
+        request = self.catalog.write_request(LookupKey.SQL_UPSERT, table)
+
+        result = BatchResult()
+        indexed = self._validated_rows(table, ((i, values, values) for i, values in enumerate(rows)), result)
+        self._write_chunks(table, request, indexed, chunk_size, result)
+        return result
+
+    def update_many(
+            self,
+            table: str,
+            rows: Mapping[str, dict[str, Any]] | Iterable[tuple[str, dict[str, Any]]],
+            chunk_size: int = 1000
+        ) -> BatchResult:
+        """
+        Updates many existing rows inside the database.
+        `rows` maps the current `ref_id` of each row to its new values, either as a mapping or as pairs.
+        Chunking and failure reporting work as in `add_many`; a `ref_id` that matches no row is reported as a failure.
+        """
+        request = self.catalog.write_request(LookupKey.SQL_UPDATE, table)
+
+        pairs = rows.items() if isinstance(rows, Mapping) else rows
+        result = BatchResult()
+        indexed = self._validated_rows(
+            table,
+            ((i, values, {**values, 'old_id': ref_id}) for i, (ref_id, values) in enumerate(pairs)),
+            result
+        )
+        self._write_chunks(table, request, indexed, chunk_size, result, must_match=True)
+        return result
+
+    def _invalidate(self, table: str, *rows: dict[str, Any]) -> None:
+        """
+        Drops the cached copies of every row touched by a write, under both its new and old `ref_id`
+        """
+        if self.cache is None:
+            return
+
+        keys = [(table, values['id']) for values in rows]
+        keys += [(table, values['old_id']) for values in rows if 'old_id' in values]
+        self.cache.invalidate(*keys)
+
+        if self.database.in_transaction:
+            if not hasattr(self._touched, "keys"):
+                self._touched.keys = set()
+            self._touched.keys.update(keys)
+
+    def _committed(self, writes: list[tuple[str, Any, Any]]) -> None:
+        """
+        Invalidates the rows of a batch of queued writes once it is committed
+        """
+        for request, values, _ in writes:
+            table = self._write_tables.get(request)
+            if table is not None and isinstance(values, dict):
+                self._invalidate(table, values)
+
+    def _validated_rows(
+            self,
+            table: str,
+            rows: Iterable[tuple[int, dict[str, Any], dict[str, Any]]],
+            result: BatchResult
+        ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        Takes (position, values, parameters) triples and yields the parameters of every row
+        whose values fit the schema of `table`, recording the rest as failures
+        """
+        for i, values, params in rows:
+            try:
+                self.catalog.verify_values(table, values)
+            except SchemaError as e:
+                result.failures.append((i, params, e))
+                continue
+            yield i, params
+
+    def _write_chunks(
+            self,
+            table: str,
+            request: str,
+            rows: Iterator[tuple[int, dict[str, Any]]],
+            chunk_size: int,
+            result: BatchResult,
+            must_match: bool = False
+        ) -> None:
+        """
+        Writes `rows` one chunk per transaction.
+        A chunk that fails as a whole is retried row by row so only the offending rows are dropped.
+        `must_match` reports rows that affected nothing, such as updates of a missing `ref_id`, as failures.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+        while chunk := list(islice(rows, chunk_size)):
+            try:
+                if must_match:
+                    # Each row runs on its own so its rowcount tells whether it matched, still in one transaction
+                    with self.database.transaction():
+                        counts = [self.database.db_modify(request, values) for _, values in chunk]
+                    for (i, values), count in zip(chunk, counts):
+                        if count:
+                            result.written += count
+                        else:
+                            result.failures.append((i, values, LookupError(f"No row of {table} matched {values}")))
+                else:
+                    result.written += self.database.db_modify_many(request, (values for _, values in chunk))
+            except sqlite3.Error:
+                # Bulk writes bypass any write-behind queue, so each row's outcome is known here
+                for i, values in chunk:
+                    try:
+                        count = self.database.db_modify_many(request, (values,))
+                    except sqlite3.Error as e:
+                        result.failures.append((i, values, e))
+                        continue
+                    if count or not must_match:
+                        result.written += count
+                    else:
+                        result.failures.append((i, values, LookupError(f"No row of {table} matched {values}")))
+
+            self._invalidate(table, *(values for _, values in chunk))
+
     def read(
             self,
-            table: str
+            table: str,
+            decode: bool = False
         ):
         """
         Retrieves all data from a single table.
+        `decode` returns each row as its game object (see sql.rows) instead of a tuple.
         """
         request = self.request(LookupKey.SQL_READ, table)
-        data = self.database.db_query(request)
+        data = self.database.db_query(request, row_factory=self.decoder(table) if decode else None)
         return data
 
+    def iter_read(
+            self,
+            table: str,
+            batch_size: int = 500,
+            columns: Optional[Iterable[str]] = None,
+            decode: bool = False
+        ) -> Iterator[Any]:
+        """
+        Lazily retrieves all data from a single table, `batch_size` rows at a time.
+        `columns` optionally restricts each row to the named columns, in the given order.
+        `decode` yields game objects instead of tuples; the projection must then include every column the object needs.
+        """
+        if columns is None:
+            request = self.request(LookupKey.SQL_READ, table)
+        else:
+            columns = list(columns)
+            if len(columns) == 0:
+                raise SchemaError(f"No columns given for {table}")
+            self._verify_columns(table, columns)
+
+            projection = ", ".join(f'"{column}"' for column in columns)
+            request = self.request(LookupKey.SQL_READ_COLUMNS, table).format(columns=projection)
+
+        row_factory = self.decoder(table) if decode else None
+        return self.database.db_iter(request, batch_size=batch_size, row_factory=row_factory)
+
+    def find(
+            self,
+            table: str,
+            order_by: Optional[str | Iterable[str]] = None,
+            limit: Optional[int] = None,
+            decode: bool = False,
+            **filters: Any
+        ) -> list[Any]:
+        """
+        Retrieves the rows of a single table that match every filter.
+        Filters take the form `column=value` or `column__operator=value`, where the operator is one of
+        `eq`, `ne`, `lt`, `le`, `gt`, `ge`, `in` (any iterable), or `startswith` (case-sensitive prefix).
+        `order_by` names one or more columns, prefixed with `-` for descending order.
+        `decode` returns game objects instead of tuples.
+
+        Filters are compiled into parameterized SQL, so the database can answer them through its indexes.
+        """
+        request = self.request(LookupKey.SQL_FIND, table)
+        row_factory = self.decoder(table) if decode else None
+        orders = [order_by] if isinstance(order_by, str) else list(order_by or [])
+        self._verify_columns(table, [order.removeprefix("-") for order in orders])
+
+        params: dict[str, Any] = {}
+        predicates = self._compile_filters(table, filters, params)
+
+        clauses = ""
+        if predicates:
+            clauses += " WHERE " + " AND ".join(predicates)
+        if orders:
+            clauses += " ORDER BY " + ", ".join(
+                f'"{order[1:]}" DESC' if order.startswith("-") else f'"{order}" ASC' for order in orders
+            )
+        if limit is not None:
+            _verify_limit(limit)
+            clauses += " LIMIT :limit"
+            params['limit'] = limit
+
+        return self.database.db_query(request.format(clauses=clauses), params, row_factory)
+
+    def _compile_filters(self, table: str, filters: Mapping[str, Any], params: dict[str, Any]) -> list[str]:
+        """
+        Compiles `find` style filters into SQL predicates, adding their bound values to `params`
+        """
+        self._verify_columns(table, [name.split("__", 1)[0] for name in filters])
+
+        predicates: list[str] = []
+        for i, (name, value) in enumerate(filters.items()):
+            column, _, operator = name.partition("__")
+            predicates.append(_compile_predicate(f'"{column}"', operator or "eq", value, f"f{i}", params))
+        return predicates
+
+    def count(self, table: str, **filters: Any) -> int:
+        """
+        Counts the rows of a single table that match every filter (see `find`), without reading them
+        """
+        params: dict[str, Any] = {}
+        predicates = self._compile_filters(table, filters, params)
+        clauses = " WHERE " + " AND ".join(predicates) if predicates else ""
+        request = self.request(LookupKey.SQL_COUNT, table).format(clauses=clauses)
+        return self.database.db_query(request, params)[0][0]
+
+    def read_page(
+            self,
+            table: str,
+            after_ref_id: Optional[str] = None,
+            limit: int = 100,
+            order_by: str = "ref_id",
+            decode: bool = False
+        ) -> list[Any]:
+        """
+        Retrieves up to `limit` rows of a single table ordered by `order_by` (prefixed with `-` for descending order),
+        starting right after the row `after_ref_id`, or from the first row.
+        Pass the `ref_id` of the last row of a page to get the next one; ties in `order_by` are broken by `ref_id`.
+        `decode` returns game objects instead of tuples.
+
+        Pages resume from the position of the previous row (keyset pagination) instead of skipping rows with OFFSET,
+        so fetching a page costs the same however deep into the table it is. That holds for `ref_id` and the columns
+        indexed together with it by schema version 4 (see `migrate`); other columns are sorted again on every page.
+        """
+        column = order_by.removeprefix("-")
+        descending = order_by.startswith("-")
+        self._verify_columns(table, [column])
+        _verify_limit(limit)
+
+        direction, after = ("DESC", "<") if descending else ("ASC", ">")
+        params: dict[str, Any] = {}
+        predicates: list[Optional[str]] = [None]
+        if column == "ref_id":
+            order = f'"ref_id" {direction}'
+            if after_ref_id is not None:
+                predicates = [f'"ref_id" {after} :after']
+                params['after'] = after_ref_id
+        else:
+            order = f'"{column}" {direction}, "ref_id" {direction}'
+            if after_ref_id is not None:
+                predicates = self._page_predicates(table, column, descending, after_ref_id, params)
+
+        request = self.request(LookupKey.SQL_FIND, table)
+        row_factory = self.decoder(table) if decode else None
+        rows: list[Any] = []
+        for predicate in predicates:
+            clauses = f" ORDER BY {order} LIMIT :limit"
+            if predicate is not None:
+                clauses = f" WHERE {predicate}" + clauses
+            rows.extend(self.database.db_query(request.format(clauses=clauses), {**params, 'limit': limit - len(rows)}, row_factory))
+            if len(rows) == limit:
+                break
+        return rows
+
+    def _page_predicates(
+            self,
+            table: str,
+            column: str,
+            descending: bool,
+            after_ref_id: str,
+            params: dict[str, Any]
+        ) -> list[Optional[str]]:
+        """
+        Predicates selecting the rows ordered after `after_ref_id` by (`column`, `ref_id`), to be read one after the other.
+        SQLite sorts NULL before every other value, and comparisons with NULL never match, so NULL rows get a predicate of their own;
+        keeping them apart instead of joining with OR lets each predicate walk the (`column`, `ref_id`) index (see sql.migrations).
+        """
+        rows = self.find(table, ref_id=after_ref_id)
+        if len(rows) == 0:
+            raise ValueError(f"{after_ref_id} not in {table}")
+        value = rows[0][self.catalog.columns(table).index(column)]
+        params['after'] = after_ref_id
+
+        if value is None:
+            if descending:
+                return [f'"{column}" IS NULL AND "ref_id" < :after']
+            return [f'"{column}" IS NULL AND "ref_id" > :after', f'"{column}" IS NOT NULL']
+
+        params['value'] = value
+        if descending:
+            return [f'("{column}", "ref_id") < (:value, :after)', f'"{column}" IS NULL']
+        return [f'("{column}", "ref_id") > (:value, :after)']
+
+    def search(
+            self,
+            text: str,
+            tables: Optional[Iterable[str]] = None,
+            limit: int = 20,
+            decode: bool = False
+        ) -> list[tuple[str, Any]]:
+        """
+        Full-text search over the `name` and `desc` of content tables (defaults to every content table).
+        Returns up to `limit` pairs of (table, row), best match first; matches in `name` weigh more than in `desc`.
+        `decode` returns game objects instead of tuples.
+
+        Needs the search indexes added by schema version 2 (see `migrate`).
+        """
+        _verify_limit(limit)
+        query = _search_query(text)
+        if query == "" or limit == 0:
+            return []
+
+        matches: list[tuple[float, str, Any]] = []
+        for table in ROW_BUILDERS if tables is None else tables:
+            request = self.request(LookupKey.SQL_SEARCH, table)
+            decoder = self.decoder(table)
+            row_factory = (lambda cursor, row: (row[0], decoder(cursor, row))) if decode else (lambda _, row: (row[0], row[1:]))
+            try:
+                rows = self.database.db_query(request, {'query': query, 'limit': limit}, row_factory)
+            except sqlite3.OperationalError as e:
+                if "no such table" in str(e):
+                    raise MigrationError(f"{table} has no search index; migrate the database to schema version 2") from e
+                raise
+            matches.extend((rank, table, row) for rank, row in rows)
+
+        # bm25 ranks are negative, lower is a better match
+        matches.sort(key=lambda match: match[0])
+        return [(table, row) for _, table, row in matches[:limit]]
+
+    def _verify_columns(self, table: str, columns: Iterable[str]) -> Literal[True]:
+        """
+        Verifies that every column exists in the table
+        """
+        table_columns = self.catalog.columns(table)
+        unknown = [column for column in columns if column not in table_columns]
+        if unknown:
+            raise SchemaError(f"Invalid columns for {table}: {unknown}")
+        return True
+
     def query_table_list(self) -> list[tuple[str]]:
         """
         Retrieves the list of all tables 
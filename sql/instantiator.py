@@ -1,4 +1,178 @@
-from sql.interface import SQLInterface
+import gc
+import hashlib
+import os
+import pickle
+import time
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Iterator, Optional, Self
+from sql.changes import Changes
+from sql.entry import DataEntry
+from sql.rows import ROW_BUILDERS
+from classes.items.item import Item
+
+"""
+Module that turns the content database into game objects at startup.
+"""
+
+Catalog = dict[str, dict[str, Item]]
+Rows = dict[str, list[tuple]]
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Suspends the cyclic garbage collector, which would otherwise rescan the catalog over and over while it is built
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 class Instantiator:
-    pass
\ No newline at end of file
+    """
+    Loads every content table of the database at `path` into an in-memory catalog,
+    mapping each table to its objects keyed by `ref_id`.
+
+    A cold load reads the database in one pass and writes a binary snapshot of the raw rows next to it (`<path>.snapshot`).
+    A warm load rebuilds the objects from that snapshot as long as the hash of the database file, and of its WAL file if any, still matches.
+    Snapshots are pickles and must only be loaded from trusted locations.
+    Use it as a context manager, or call `close()`, to release its database connection.
+    """
+    SNAPSHOT_FORMAT = 1
+
+    def __init__(
+            self,
+            path: Optional[str] = None,
+            snapshot_path: Optional[str] = None
+        ):
+        self.entry = DataEntry(path)
+        self.snapshot_path = snapshot_path if snapshot_path is not None else f"{self.entry.database.path}.snapshot"
+
+        # Details of the last load, for reporting startup cost
+        self.source: Optional[str] = None
+        self.load_time: Optional[float] = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Releases the connections of the underlying `DataEntry`
+        """
+        self.entry.close()
+
+    def fingerprint(self) -> str:
+        """
+        Hash of the database file, used to tell whether a snapshot is still current.
+        In WAL mode, commits stay in `<path>-wal` until checkpointed, so that file is hashed too when it exists.
+        """
+        digest = hashlib.sha256()
+        path = self.entry.database.path
+        for file_path in (path, f"{path}-wal"):
+            try:
+                with open(file_path, "rb") as file:
+                    digest.update(hashlib.file_digest(file, "sha256").digest())
+            except FileNotFoundError:
+                if file_path == path:
+                    raise
+        return digest.hexdigest()
+
+    def load(self, use_snapshot: bool = True) -> Catalog:
+        """
+        Returns the content catalog, preferring a current snapshot over the database
+        """
+        start = time.perf_counter()
+        fingerprint = self.fingerprint()
+
+        with _gc_paused():
+            rows = self.read_snapshot(fingerprint) if use_snapshot else None
+            if rows is not None:
+                self.source = "snapshot"
+            else:
+                rows = self.read_rows()
+                self.source = "database"
+                if use_snapshot:
+                    self.write_snapshot(rows, fingerprint)
+            catalog = self.instantiate(rows)
+
+        self.load_time = time.perf_counter() - start
+        return catalog
+
+    def build(self) -> Catalog:
+        """
+        Reads every content table from the database into game objects
+        """
+        return self.instantiate(self.read_rows())
+
+    def read_rows(self) -> Rows:
+        """
+        Reads the columns of every content table needed to build its objects
+        """
+        return {
+            table: list(self.entry.iter_read(table, columns=columns))
+            for table, (columns, _) in ROW_BUILDERS.items()
+        }
+
+    def instantiate(self, rows: Rows) -> Catalog:
+        """
+        Builds the game objects of every content table, keyed by `ref_id`
+        """
+        catalog: Catalog = {}
+        for table, (_, builder) in ROW_BUILDERS.items():
+            catalog[table] = {row[0]: builder(*row) for row in rows[table]}
+        return catalog
+
+    def reload(self, catalog: Catalog, changes: Changes, chunk_size: int = 500) -> Catalog:
+        """
+        Brings `catalog` up to date in place by reloading only the rows in `changes` (see sql.changes),
+        `chunk_size` rows per query. Rows that no longer exist are removed.
+        Falls back to a full rebuild when the changes are incomplete.
+        """
+        if not changes.complete:
+            catalog.clear()
+            catalog.update(self.build())
+            return catalog
+
+        for table, ref_ids in changes.rows.items():
+            if table not in ROW_BUILDERS:
+                continue
+            objects = catalog.setdefault(table, {})
+            pending = iter(ref_ids)
+            while chunk := list(islice(pending, chunk_size)):
+                found = {obj.metadata.id: obj for obj in self.entry.find(table, decode=True, ref_id__in=chunk)}
+                for ref_id in chunk:
+                    if ref_id in found:
+                        objects[ref_id] = found[ref_id]
+                    else:
+                        objects.pop(ref_id, None)
+        return catalog
+
+    def read_snapshot(self, fingerprint: str) -> Optional[Rows]:
+        """
+        Returns the snapshot's rows, or None if it is missing, unreadable, or stale
+        """
+        try:
+            with open(self.snapshot_path, "rb") as file:
+                snapshot: dict[str, Any] = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+        if snapshot.get('format') != self.SNAPSHOT_FORMAT or snapshot.get('fingerprint') != fingerprint:
+            return None
+        return snapshot['rows']
+
+    def write_snapshot(self, rows: Rows, fingerprint: str) -> None:
+        """
+        Atomically replaces the snapshot with `rows`
+        """
+        snapshot = {'format': self.SNAPSHOT_FORMAT, 'fingerprint': fingerprint, 'rows': rows}
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.snapshot_path)
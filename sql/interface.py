@@ -1,52 +1,451 @@
 import sqlite3
-from typing import Any, Optional
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional, Self
+from sql.metrics import QueryMetrics
+from sql.writeback import WriteBehind, WriteBehindPolicy
+
+# Named PRAGMA sets applied to every connection when it is opened.
+# `journal_mode` persists in the database file and is skipped for read-only and in-memory connections.
+PRAGMA_PROFILES: dict[str, dict[str, Any]] = {
+    'default': {},
+    'editor': {
+        'journal_mode': "WAL",
+        'synchronous': "NORMAL",
+        'cache_size': -16384,
+        'temp_store': "MEMORY"
+    },
+    'runtime-readonly': {
+        'query_only': "ON",
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': "MEMORY"
+    },
+    'bulk-import': {
+        'journal_mode': "WAL",
+        'synchronous': "OFF",
+        'cache_size': -262144,
+        'temp_store': "MEMORY"
+    }
+}
+
+RowFactory = Callable[[sqlite3.Cursor, tuple], Any]
 
 class SQLInterface:
     """
     Class interface for sending queries to the SQL database
     `path` defaults to `"sql/object_init.db"` but can be specified to any valid SQL database path.
+    `pooled` keeps one persistent connection per thread instead of reconnecting on every request.
+    `shared_reads` routes every `db_query` through a single read-only connection shared by all threads.
+    `cached_statements` is the number of prepared statements each connection keeps for reuse.
+    `in_memory` copies the database into memory on first use and serves every request from that copy;
+    the copy is read-only and reflects the file as it was when loaded.
+    `profile` names the set of `PRAGMA_PROFILES` tuning pragmas applied to each connection.
+    `metrics` optionally counts and times every request (see sql.metrics).
+    `write_behind` queues `db_modify` calls made outside `transaction()` and applies them in batches
+    on a background thread (see sql.writeback); reads only see them once flushed.
+
+    Pooled connections stay open until `close()` is called or the interface is used as a context manager.
+    Requests made by a thread inside `transaction()` share that transaction's connection and are committed together.
     """
     def __init__(
-            self, 
-            path: Optional[str] = "sql/object_init.db"
+            self,
+            path: Optional[str] = "sql/object_init.db",
+            pooled: bool = True,
+            shared_reads: bool = False,
+            cached_statements: int = 256,
+            in_memory: bool = False,
+            profile: str = "default",
+            metrics: Optional[QueryMetrics] = None,
+            write_behind: Optional[WriteBehindPolicy] = None
         ):
+        if profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Unknown pragma profile {profile!r}; expected one of {list(PRAGMA_PROFILES)}")
+
         self.__database_path = path if path is not None else "sql/object_init.db"
+        self.__pooled = pooled
+        self.__shared_reads = shared_reads
+        self.__cached_statements = cached_statements
+        self.__profile = profile
+        self.__metrics = metrics
+        self.__writer = WriteBehind(self, write_behind) if write_behind is not None else None
+
+        # Per-thread connections are tagged with a generation so that `close()` invalidates them everywhere
+        self.__local = threading.local()
+        self.__generation = 0
+        self.__connections: list[tuple[threading.Thread, sqlite3.Connection]] = []
+        self.__pool_lock = threading.Lock()
+
+        self.__read_conn: Optional[sqlite3.Connection] = None
+        self.__read_lock = threading.Lock()
+
+        # The in-memory copy is a shared-cache database that lives as long as its anchor connection stays open
+        self.__in_memory = in_memory
+        self.__memory_uri = f"file:sqlinterface-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.__memory_anchor: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
 
     @property
     def path(self):
         return self.__database_path
-    
+
+    @property
+    def pooled(self) -> bool:
+        return self.__pooled
+
+    @property
+    def shared_reads(self) -> bool:
+        return self.__shared_reads
+
+    @property
+    def in_memory(self) -> bool:
+        return self.__in_memory
+
+    @property
+    def profile(self) -> str:
+        return self.__profile
+
+    @property
+    def metrics(self) -> Optional[QueryMetrics]:
+        return self.__metrics
+
+    @property
+    def writer(self) -> Optional[WriteBehind]:
+        return self.__writer
+
+    @property
+    def in_transaction(self) -> bool:
+        """
+        Whether the calling thread is inside `transaction()`
+        """
+        return getattr(self.__local, "txn", None) is not None
+
+    def connect(self, readonly: bool = False) -> sqlite3.Connection:
+        """
+        Opens a new connection to the database.
+        The caller owns the returned connection and is responsible for closing it.
+        """
+        if self.__in_memory:
+            self.__load_memory_copy()
+            conn = sqlite3.connect(self.__memory_uri, uri=True, check_same_thread=False, cached_statements=self.__cached_statements)
+            self.__apply_profile(conn, persistent=False)
+            conn.execute("PRAGMA query_only = ON;")
+            return conn
+
+        if readonly:
+            uri = f"{Path(self.__database_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=self.__cached_statements)
+        else:
+            conn = sqlite3.connect(self.__database_path, check_same_thread=False, cached_statements=self.__cached_statements)
+        self.__apply_profile(conn, persistent=not readonly)
+        return conn
+
+    def __apply_profile(self, conn: sqlite3.Connection, persistent: bool) -> None:
+        for pragma, value in PRAGMA_PROFILES[self.__profile].items():
+            if pragma == 'journal_mode' and not persistent:
+                continue
+            conn.execute(f"PRAGMA {pragma} = {value};")
+
+    def __load_memory_copy(self) -> None:
+        """
+        Copies the database file into memory with the SQLite backup API, unless already loaded
+        """
+        with self.__pool_lock:
+            if self.__memory_anchor is not None:
+                return
+
+            anchor = sqlite3.connect(self.__memory_uri, uri=True, check_same_thread=False)
+            uri = f"{Path(self.__database_path).resolve().as_uri()}?mode=ro"
+            with closing(sqlite3.connect(uri, uri=True)) as source:
+                source.backup(anchor)
+            anchor.execute("PRAGMA query_only = ON;")
+            self.__memory_anchor = anchor
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Returns the persistent connection owned by the calling thread, opening it on first use.
+        Connections of threads that have exited are closed when the next one is opened.
+        """
+        cached = getattr(self.__local, "conn", None)
+        if cached is not None and cached[0] == self.__generation:
+            return cached[1]
+
+        conn = self.connect()
+        with self.__pool_lock:
+            # Threads never hand their connection back, so those left by threads that have exited are closed here
+            dead = [owned for owned in self.__connections if not owned[0].is_alive()]
+            self.__connections = [owned for owned in self.__connections if owned[0].is_alive()]
+            self.__connections.append((threading.current_thread(), conn))
+            self.__local.conn = (self.__generation, conn)
+        for _, stale in dead:
+            stale.close()
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Groups every request made by the calling thread into one `BEGIN IMMEDIATE` transaction,
+        committed on exit and rolled back if an exception escapes.
+        Nested calls open savepoints, so an inner failure only undoes the inner block.
+        """
+        state = getattr(self.__local, "txn", None)
+        if state is not None:
+            conn, depth = state
+            savepoint = f"sp_{depth}"
+            conn.execute(f"SAVEPOINT {savepoint};")
+            self.__local.txn = (conn, depth + 1)
+            try:
+                yield conn
+            except BaseException:
+                conn.execute(f"ROLLBACK TO {savepoint};")
+                conn.execute(f"RELEASE {savepoint};")
+                raise
+            else:
+                conn.execute(f"RELEASE {savepoint};")
+            finally:
+                self.__local.txn = state
+            return
+
+        # Queued writes come first, so the transaction sees and follows them
+        self.flush()
+
+        conn = self.connection() if self.__pooled else self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            self.__local.txn = (conn, 1)
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self.__local.txn = None
+        finally:
+            if not self.__pooled:
+                conn.close()
+
+    def __transaction_connection(self) -> Optional[sqlite3.Connection]:
+        state = getattr(self.__local, "txn", None)
+        return state[0] if state is not None else None
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection, including the shared read-only one, and drops the in-memory copy.
+        Queued writes are flushed first, raising `WriteBehindError` after cleanup if any of them failed.
+        The interface stays usable; connections are reopened lazily on the next request.
+        """
+        try:
+            if self.__writer is not None:
+                self.__writer.close()
+        finally:
+            self.__close_connections()
+
+    def __close_connections(self) -> None:
+        with self.__pool_lock:
+            self.__generation += 1
+            connections, self.__connections = self.__connections, []
+        for _, conn in connections:
+            conn.close()
+
+        with self.__read_lock:
+            if self.__read_conn is not None:
+                self.__read_conn.close()
+                self.__read_conn = None
+
+        with self.__pool_lock:
+            if self.__memory_anchor is not None:
+                self.__memory_anchor.close()
+                self.__memory_anchor = None
+
     def db_query(
-            self, 
-            request: str, 
-            data: dict[str, Any] = {}
+            self,
+            request: str,
+            data: dict[str, Any] = {},
+            row_factory: Optional[RowFactory] = None
         ) -> list[Any]:
         """
         Requests data from the database and returns its fetch result.
         `request` must be a valid SQL request.
-        `data` is any optional data needed by request (such as named replacement fields) 
+        `data` is any optional data needed by request (such as named replacement fields)
+        `row_factory` optionally converts each row as it is fetched, as with `sqlite3.Cursor.row_factory`
+        """
+        txn = self.__transaction_connection()
+        if txn is not None:
+            return self.__fetch(txn, request, data, row_factory)
+
+        if self.__shared_reads:
+            with self.__read_lock:
+                if self.__read_conn is None:
+                    self.__read_conn = self.connect(readonly=True)
+                return self.__fetch(self.__read_conn, request, data, row_factory)
+
+        if self.__pooled:
+            return self.__fetch(self.connection(), request, data, row_factory)
+
+        with closing(self.connect()) as conn:
+            return self.__fetch(conn, request, data, row_factory)
+
+    def __fetch(
+            self,
+            conn: sqlite3.Connection,
+            request: str,
+            data: dict[str, Any],
+            row_factory: Optional[RowFactory]
+        ) -> list[Any]:
+        if self.__metrics is None:
+            return self.__execute(conn, request, data, row_factory).fetchall()
+
+        start = time.perf_counter()
+        rows = self.__execute(conn, request, data, row_factory).fetchall()
+        self.__metrics.record(request, time.perf_counter() - start, len(rows))
+        return rows
+
+    @staticmethod
+    def __execute(
+            conn: sqlite3.Connection,
+            request: str,
+            data: dict[str, Any],
+            row_factory: Optional[RowFactory]
+        ) -> sqlite3.Cursor:
+        cur = conn.cursor()
+        cur.row_factory = row_factory
+        return cur.execute(request, data)
+
+
+    def db_iter(
+            self,
+            request: str,
+            data: dict[str, Any] = {},
+            batch_size: int = 500,
+            row_factory: Optional[RowFactory] = None
+        ) -> Iterator[Any]:
         """
-        with sqlite3.connect(self.__database_path) as conn:
-            cur = conn.cursor()
+        Requests data from the database and yields its rows one at a time.
+        Rows are pulled from a live cursor `batch_size` at a time, so memory use does not grow with the result size.
+        `row_factory` works as in `db_query`.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        txn = self.__transaction_connection()
+        if txn is not None:
+            yield from self.__iter_cursor(txn, request, data, row_factory, batch_size)
+            return
+
+        # The shared read connection is locked per request, so long-lived cursors get a connection of their own
+        if self.__pooled and not self.__shared_reads:
+            yield from self.__iter_cursor(self.connection(), request, data, row_factory, batch_size)
+            return
 
-            cur.execute(request, data)
-            return cur.fetchall()
-        
+        with closing(self.connect(readonly=self.__shared_reads)) as conn:
+            yield from self.__iter_cursor(conn, request, data, row_factory, batch_size)
+
+    def __iter_cursor(
+            self,
+            conn: sqlite3.Connection,
+            request: str,
+            data: dict[str, Any],
+            row_factory: Optional[RowFactory],
+            batch_size: int
+        ) -> Iterator[Any]:
+        # Only time spent inside SQLite is measured, not the time the caller spends between batches
+        start = time.perf_counter()
+        cur = self.__execute(conn, request, data, row_factory)
+        elapsed = time.perf_counter() - start
+        rows = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                batch = cur.fetchmany(batch_size)
+                elapsed += time.perf_counter() - start
+                if not batch:
+                    break
+                rows += len(batch)
+                yield from batch
+        finally:
+            cur.close()
+            if self.__metrics is not None:
+                self.__metrics.record(request, elapsed, rows)
+
+    def flush(self) -> None:
+        """
+        Durability barrier: returns once every write queued by `write_behind` before the call is committed
+        """
+        if self.__writer is not None:
+            self.__writer.flush()
 
     def db_modify(
             self,
             request: str,
-            data: dict[str, Any] = {}
-        ) -> None:
+            data: dict[str, Any] = {},
+            key: Optional[Hashable] = None
+        ) -> Optional[int]:
         """
         Modifies data from the database
         `request` must be a valid SQL request.
-        `data` is any optional data needed by request (such as named replacement fields) 
+        `data` is any optional data needed by request (such as named replacement fields)
+        `key` identifies the row the request overwrites; with `write_behind`, the latest queued write of that row
+        is replaced instead of written twice when it uses the same request. Only pass it when the last write alone gives the same result.
+        Returns the number of rows affected, or None when the write was queued.
         """
-        with sqlite3.connect(self.__database_path) as conn:
-            cur = conn.cursor()
+        start = time.perf_counter()
+        txn = self.__transaction_connection()
+        if txn is not None:
+            cur = txn.execute(request, data)
+        elif self.__writer is not None:
+            self.__writer.submit(request, data, key)
+            return None
+        elif self.__pooled:
+            conn = self.connection()
+            with conn:
+                cur = conn.execute(request, data)
+        else:
+            with closing(self.connect()) as conn:
+                cur = conn.cursor()
+
+                cur.execute(request, data)
+                conn.commit()
 
-            cur.execute(request, data)
-            conn.commit()
+        if self.__metrics is not None:
+            self.__metrics.record(request, time.perf_counter() - start, cur.rowcount)
+        return cur.rowcount
+
+    def db_modify_many(
+            self,
+            request: str,
+            data: Iterable[dict[str, Any]]
+        ) -> int:
+        """
+        Runs `request` once for every entry of `data` inside a single transaction.
+        Either every row is written or, on error, none are.
+        Returns the number of rows affected.
+        Inside `transaction()`, the rows are written under a savepoint instead.
+        """
+        if not self.in_transaction:
+            self.flush()
 
+        start = time.perf_counter()
+        if self.in_transaction:
+            with self.transaction() as conn:
+                rowcount = conn.executemany(request, data).rowcount
+        elif self.__pooled:
+            conn = self.connection()
+            with conn:
+                rowcount = conn.executemany(request, data).rowcount
+        else:
+            with closing(self.connect()) as conn:
+                rowcount = conn.executemany(request, data).rowcount
+                conn.commit()
 
+        if self.__metrics is not None:
+            self.__metrics.record(request, time.perf_counter() - start, rowcount)
+        return rowcount
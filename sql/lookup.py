@@ -1,7 +1,10 @@
-from typing import Dict, Set, Literal, Any
+from typing import Callable, Dict, Set, Literal, Any, Optional, TYPE_CHECKING
 from sql.interface import SQLInterface
 from enum import Enum
 
+if TYPE_CHECKING:
+    from sql.catalog import TableCatalog
+
 class LookupType(Enum):
     """
     Enum for classifying lookup types and their types of handling/processing on retrieval
@@ -23,18 +26,27 @@ class LookupKey(Enum):
     Uses constants instead of keys.
     """
     TABLE_LIST = "table_list"
-    TABLE_SCHEMA = "table_schema"
     SQL_GET = "sql_get"
+    SQL_GET_MANY = "sql_get_many"
     SQL_TABLE_SCHEMA = "sql_query_table_schema"
+    SQL_TABLE_INFO = "sql_query_table_info"
     SQL_TABLE_LIST = "sql_query_table_list"
     SQL_READ = "sql_read"
+    SQL_READ_COLUMNS = "sql_read_columns"
+    SQL_FIND = "sql_find"
+    SQL_SEARCH = "sql_search"
+    SQL_COUNT = "sql_count"
     SQL_UPDATE = "sql_update"
     SQL_CREATE = "sql_create"
+    SQL_UPSERT = "sql_upsert"
 
-def lookup(key: str | LookupKey, table: str = ""):
+def lookup(key: str | LookupKey, table: str = "", catalog: Optional["TableCatalog"] = None):
     """
     Main lookup function
     Takes a key and some table information for lookup values that need additional processing
+    `catalog` is the table catalog of the database the request is meant for.
+
+    Results are served from a table of precompiled statements; pairs not compiled at import are compiled once on first use.
     """
 
     # Convert lookup key to its string equivalent
@@ -42,36 +54,42 @@ def lookup(key: str | LookupKey, table: str = ""):
         _key = key.value
     else:
         _key = key
-    
-    # Access type and values
-    lookup_type: LookupType = _SQL_Info[_key]['type'].value
-    lookup_value: Any = _SQL_Info[_key]['value']
+
+    statement = _Statements.get((_key, table))
+    if statement is None:
+        info = _SQL_Info[_key]
+        if not table == "":
+            verify_table(table, catalog)
+        statement = _compile(info, table)
+        _Statements[(_key, table)] = statement
+        return statement
 
     if not table == "":
-        verify_table(table)
-
-    if lookup_type == 0:
-        return lookup_value
-    elif lookup_type == 1:
-        f_request: str = lookup_value.format(table=table)
-        return f_request
-    elif lookup_type == 2:
-        s_request: str = lookup_value[table]
-        return s_request
-    elif lookup_type == 3:
-        return lookup_value[table]
-    else:
+        verify_table(table, catalog)
+    return statement
+
+def _compile(info: Dict[str, Any], table: str) -> Any:
+    """
+    Resolves a single `_SQL_Info` entry for `table`
+    """
+    try:
+        compiler = _Compilers[info['type']]
+    except KeyError:
         raise NotImplementedError("Something went wrong.")
+    return compiler(info['value'], table)
 
-def verify_table(table: str) -> Literal[True]:
+def verify_table(table: str, catalog: Optional["TableCatalog"] = None) -> Literal[True]:
     """
     Verify whether the table is in the table of all possible tables.
-    Directly queries SQL database to retrieve a list of tables
+    Checks against `catalog` when given, otherwise directly queries the default SQL database to retrieve a list of tables
     """
-    sqlinter = SQLInterface()
+    if catalog is not None:
+        return catalog.verify(table)
+
     table_list_request: str = _SQL_Info['sql_query_table_list']['value']
-    
-    table_list = [table[0] for table in sqlinter.db_query(table_list_request)]
+
+    with SQLInterface() as sqlinter:
+        table_list = [table[0] for table in sqlinter.db_query(table_list_request)]
     
     if table in table_list:
         return True
@@ -85,14 +103,24 @@ _SQL_Info: Dict[str | LookupKey, Dict[str, Any]] = {
         'value': "SELECT * FROM {table} WHERE ref_id = :key;"
     },
 
+    'sql_get_many': {
+        'type': LookupType.REQ_FORMAT,
+        'value': "SELECT t.* FROM json_each(:keys) AS k CROSS JOIN {table} AS t ON t.ref_id = k.value;"
+    },
+
     'sql_query_table_schema': {
         'type': LookupType.REQ_FORMAT,
         'value': "SELECT name, type FROM PRAGMA_TABLE_INFO('{table}');"
     },
 
+    'sql_query_table_info': {
+        'type': LookupType.REQ_FORMAT,
+        'value': "SELECT name, type, \"notnull\", pk FROM PRAGMA_TABLE_INFO('{table}');"
+    },
+
     'sql_query_table_list': {
         'type': LookupType.REQUEST,
-        'value': "SELECT name FROM sqlite_schema WHERE type = 'table' AND name NOT LIKE 'sqlite_%';"
+        'value': "SELECT name FROM pragma_table_list WHERE schema = 'main' AND type = 'table' AND name NOT LIKE 'sqlite_%';"
     },
     
     'sql_read': {
@@ -100,13 +128,25 @@ _SQL_Info: Dict[str | LookupKey, Dict[str, Any]] = {
         'value': "SELECT * FROM {table};"
     },
 
-    'table_schema': {
-        'type': LookupType.ANY_LOOKUP,
-        'value': {
-            'item': {'id', 'name', 'desc'},
-            'usable': {'id', 'name', 'desc', 'use_type', 'use_param'},
-            'equip': {'id', 'name', 'desc', 'element', 'attribute', 'skill', 'is_dual_wield'}
-        }
+    'sql_read_columns': {
+        'type': LookupType.REQ_FORMAT,
+        'value': "SELECT {{columns}} FROM {table};"
+    },
+
+    'sql_find': {
+        'type': LookupType.REQ_FORMAT,
+        'value': "SELECT * FROM {table}{{clauses}};"
+    },
+
+    'sql_count': {
+        'type': LookupType.REQ_FORMAT,
+        'value': "SELECT count(*) FROM {table}{{clauses}};"
+    },
+
+    'sql_search': {
+        'type': LookupType.REQ_FORMAT,
+        'value': "SELECT bm25({table}_search, 10.0, 1.0) AS rank, t.* FROM {table}_search JOIN {table} AS t ON t.rowid = {table}_search.rowid "
+                 "WHERE {table}_search MATCH :query ORDER BY rank LIMIT :limit;"
     },
 
     'sql_create': {
@@ -123,7 +163,47 @@ _SQL_Info: Dict[str | LookupKey, Dict[str, Any]] = {
         'value': {
             'item': "UPDATE item SET ref_id = :id, name = :name, desc = :desc WHERE ref_id = :old_id;",
             'usable': "UPDATE usable SET ref_id = :id, name = :name, desc = :desc, use_type = :use_type, use_param = :use_param WHERE ref_id = :old_id;",
-            'equip': "UPDATE equip SET ref_id = :id, name = :name, desc = :desc, element = :element, attribute_data = :attribute, skill = :skill, dual_wield = :is_dual_wield WHERE ref_id = :old_id;",
+            'equip': "UPDATE equip SET ref_id = :id, name = :name, desc = :desc, element = :element, attribute = :attribute, skill = :skill, dual_wield = :is_dual_wield WHERE ref_id = :old_id;",
+        }
+    },
+
+    'sql_upsert': {
+        'type': LookupType.REQ_LOOKUP,
+        'value': {
+            'item': "INSERT INTO item (ref_id, name, desc) VALUES (:id, :name, :desc) "
+                    "ON CONFLICT (ref_id) DO UPDATE SET name = excluded.name, desc = excluded.desc;",
+            'usable': "INSERT INTO usable (ref_id, name, desc, use_type, use_param) VALUES (:id, :name, :desc, :use_type, :use_param) "
+                      "ON CONFLICT (ref_id) DO UPDATE SET name = excluded.name, desc = excluded.desc, use_type = excluded.use_type, use_param = excluded.use_param;",
+            'equip': "INSERT INTO equip (ref_id, name, desc, element, attribute, skill, dual_wield) VALUES (:id, :name, :desc, :element, :attribute, :skill, :is_dual_wield) "
+                     "ON CONFLICT (ref_id) DO UPDATE SET name = excluded.name, desc = excluded.desc, element = excluded.element, attribute = excluded.attribute, skill = excluded.skill, dual_wield = excluded.dual_wield;",
         }
     }   
-}
\ No newline at end of file
+}
+
+_Compilers: Dict[LookupType, Callable[[Any, str], Any]] = {
+    LookupType.REQUEST: lambda value, table: value,
+    LookupType.REQ_FORMAT: lambda value, table: value.format(table=table),
+    LookupType.REQ_LOOKUP: lambda value, table: value[table]
+}
+
+def _precompile() -> Dict[tuple[str, str], Any]:
+    """
+    Compiles every key against every table named in the table specific lookups
+    """
+    tables = {
+        table
+        for info in _SQL_Info.values() if info['type'] == LookupType.REQ_LOOKUP
+        for table in info['value']
+    }
+
+    statements: Dict[tuple[str, str], Any] = {}
+    for key, info in _SQL_Info.items():
+        if info['type'] == LookupType.REQUEST:
+            statements[(key, "")] = _compile(info, "")
+            continue
+        for table in tables:
+            if info['type'] == LookupType.REQ_FORMAT or table in info['value']:
+                statements[(key, table)] = _compile(info, table)
+    return statements
+
+_Statements: Dict[tuple[str, str], Any] = _precompile()
@@ -0,0 +1,113 @@
+import logging
+import threading
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+"""
+Module that contains query instrumentation for `SQLInterface`.
+"""
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the latency histogram buckets; the last bucket counts everything slower
+LATENCY_BUCKETS: tuple[float, ...] = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+@dataclass(frozen=True)
+class StatementStats:
+    """
+    Counters of a single SQL statement.
+    `histogram[i]` counts executions no slower than `LATENCY_BUCKETS[i]`, and the final entry those slower than all of them.
+    """
+    statement: str
+    count: int
+    total_time: float
+    max_time: float
+    rows: int
+    histogram: tuple[int, ...]
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+@dataclass(frozen=True)
+class SlowQuery:
+    """
+    Single execution that took at least the slow query threshold
+    """
+    statement: str
+    elapsed: float
+    rows: int
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """
+    Snapshot of every counter of a `QueryMetrics`
+    """
+    statements: Mapping[str, StatementStats]
+    slow_queries: tuple[SlowQuery, ...]
+
+    @property
+    def queries(self) -> int:
+        return sum(stats.count for stats in self.statements.values())
+
+    @property
+    def total_time(self) -> float:
+        return sum(stats.total_time for stats in self.statements.values())
+
+    @property
+    def rows(self) -> int:
+        return sum(stats.rows for stats in self.statements.values())
+
+class QueryMetrics:
+    """
+    Thread-safe per-statement counters, fed by an `SQLInterface` created with `metrics=`.
+    Every `db_query`, `db_iter`, `db_modify` and `db_modify_many` call counts as one execution of its statement;
+    rows are those returned by reads and affected by writes.
+
+    Executions taking `slow_query_time` seconds or more are logged to the `sql.metrics` logger
+    and the latest `slow_log_size` of them are kept for `snapshot()`.
+    """
+    def __init__(self, slow_query_time: Optional[float] = None, slow_log_size: int = 100):
+        self.slow_query_time = slow_query_time
+
+        self._lock = threading.Lock()
+        self._stats: dict[str, list] = {}
+        self._slow: deque[SlowQuery] = deque(maxlen=slow_log_size)
+
+    def record(self, statement: str, elapsed: float, rows: int) -> None:
+        """
+        Counts one execution of `statement`
+        """
+        bucket = bisect_left(LATENCY_BUCKETS, elapsed)
+        with self._lock:
+            stats = self._stats.get(statement)
+            if stats is None:
+                stats = self._stats[statement] = [0, 0.0, 0.0, 0, [0] * (len(LATENCY_BUCKETS) + 1)]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            stats[3] += max(rows, 0)
+            stats[4][bucket] += 1
+
+            slow = self.slow_query_time is not None and elapsed >= self.slow_query_time
+            if slow:
+                self._slow.append(SlowQuery(statement, elapsed, rows))
+
+        if slow:
+            logger.warning("Slow query (%.1f ms, %d rows): %s", elapsed * 1000, rows, statement)
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            statements = {
+                statement: StatementStats(statement, count, total, longest, rows, tuple(histogram))
+                for statement, (count, total, longest, rows, histogram) in self._stats.items()
+            }
+            return MetricsSnapshot(MappingProxyType(statements), tuple(self._slow))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+            self._slow.clear()
@@ -0,0 +1,146 @@
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Optional
+from sql.interface import SQLInterface
+
+"""
+Module that contains the versioned schema migrations of the content database.
+The version of a database is tracked with `PRAGMA user_version`.
+"""
+
+class MigrationError(Exception):
+    """
+    Raises when a database cannot be migrated to the requested version
+    """
+    pass
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Single schema change, applied atomically together with its version bump
+    """
+    version: int
+    description: str
+    statements: tuple[str, ...]
+
+def _search_index(table: str) -> tuple[str, ...]:
+    """
+    Statements for an external-content FTS5 index over the `name` and `desc` of `table`, kept in sync by triggers
+    """
+    index = f"{table}_search"
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5("
+        f"name, \"desc\", content = '{table}', tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3');",
+        f"CREATE TRIGGER IF NOT EXISTS {index}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {index} (rowid, name, \"desc\") VALUES (new.rowid, new.name, new.\"desc\"); END;",
+        f"CREATE TRIGGER IF NOT EXISTS {index}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {index} ({index}, rowid, name, \"desc\") VALUES ('delete', old.rowid, old.name, old.\"desc\"); END;",
+        f"CREATE TRIGGER IF NOT EXISTS {index}_update AFTER UPDATE OF name, \"desc\" ON {table} BEGIN "
+        f"INSERT INTO {index} ({index}, rowid, name, \"desc\") VALUES ('delete', old.rowid, old.name, old.\"desc\"); "
+        f"INSERT INTO {index} (rowid, name, \"desc\") VALUES (new.rowid, new.name, new.\"desc\"); END;",
+        f"INSERT INTO {index} ({index}) VALUES ('rebuild');"
+    )
+
+def _changelog(table: str) -> tuple[str, ...]:
+    """
+    Triggers recording the `ref_id` of every row of `table` that is written into `content_changes`.
+    A renamed row is recorded under both its old and new `ref_id`.
+    """
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS {table}_changes_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO content_changes (table_name, ref_id) VALUES ('{table}', new.ref_id); END;",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_changes_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO content_changes (table_name, ref_id) VALUES ('{table}', old.ref_id); END;",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_changes_update AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO content_changes (table_name, ref_id) VALUES ('{table}', old.ref_id); "
+        f"INSERT INTO content_changes (table_name, ref_id) SELECT '{table}', new.ref_id WHERE new.ref_id IS NOT old.ref_id; END;"
+    )
+
+def _page_index(table: str, column: str) -> tuple[str, ...]:
+    """
+    Statements replacing the index on `column` with one on (`column`, `ref_id`), the order `DataEntry.read_page` walks.
+    Rows sharing a value are then read in index order instead of sorting every tie group again on each page.
+    """
+    index = f"idx_{table}_{column}"
+    return (
+        f"DROP INDEX IF EXISTS {index};",
+        f"CREATE INDEX {index} ON {table} ({column}, ref_id);"
+    )
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "Secondary indexes on content lookup columns", (
+        "CREATE INDEX IF NOT EXISTS idx_item_name ON item (name);",
+        "CREATE INDEX IF NOT EXISTS idx_usable_use_type ON usable (use_type);",
+        "CREATE INDEX IF NOT EXISTS idx_equip_name ON equip (name);",
+        "CREATE INDEX IF NOT EXISTS idx_equip_element ON equip (element);",
+        "CREATE INDEX IF NOT EXISTS idx_equip_dual_wield ON equip (dual_wield);",
+    )),
+    Migration(2, "Full-text search indexes over content names and descriptions", (
+        *_search_index("item"),
+        *_search_index("usable"),
+        *_search_index("equip"),
+    )),
+    Migration(3, "Changelog of written content rows, for hot reloading", (
+        "CREATE TABLE IF NOT EXISTS content_changes ("
+        "change_id INTEGER PRIMARY KEY AUTOINCREMENT, table_name TEXT NOT NULL, ref_id TEXT NOT NULL);",
+        *_changelog("item"),
+        *_changelog("usable"),
+        *_changelog("equip"),
+    )),
+    Migration(4, "Extend the lookup column indexes with ref_id, for keyset pagination", (
+        *_page_index("item", "name"),
+        *_page_index("usable", "use_type"),
+        *_page_index("equip", "name"),
+        *_page_index("equip", "element"),
+        *_page_index("equip", "dual_wield"),
+    )),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+def current_version(database: SQLInterface) -> int:
+    """
+    Returns the schema version the database was last migrated to
+    """
+    return database.db_query("PRAGMA user_version;")[0][0]
+
+def migrate(
+        database: SQLInterface,
+        target: Optional[int] = None,
+        analyze: bool = True
+    ) -> list[int]:
+    """
+    Applies every pending migration up to `target` (defaults to the latest), one transaction per migration.
+    Refreshes the query planner statistics with `ANALYZE` when anything was applied.
+    Returns the versions that were applied.
+    """
+    target = LATEST_VERSION if target is None else target
+    if not 0 <= target <= LATEST_VERSION:
+        raise MigrationError(f"Unknown schema version {target}; latest is {LATEST_VERSION}")
+
+    applied: list[int] = []
+    with closing(database.connect()) as conn:
+        conn.isolation_level = None
+        version = conn.execute("PRAGMA user_version;").fetchone()[0]
+        if version > target:
+            raise MigrationError(f"Database is at schema version {version}, downgrading to {target} is not supported")
+
+        for migration in MIGRATIONS:
+            if not version < migration.version <= target:
+                continue
+
+            conn.execute("BEGIN IMMEDIATE;")
+            try:
+                for statement in migration.statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {migration.version};")
+                conn.execute("COMMIT;")
+            except BaseException:
+                conn.execute("ROLLBACK;")
+                raise
+            applied.append(migration.version)
+
+        if applied and analyze:
+            conn.execute("ANALYZE;")
+
+    return applied
@@ -0,0 +1,266 @@
+import argparse
+import io
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Iterator, Optional, Self, Sequence
+from sql.entry import DataEntry
+from sql.rows import ROW_BUILDERS, RowDecoder
+from classes.items.item import Item
+
+"""
+Compiled, read-only content packs for runtime lookup of content by `ref_id` without SQLite.
+
+Layout (little-endian):
+    header      magic, format version, table count, string table offset and length
+    directory   one entry per table: name, column names, column kinds, record count, records offset
+    records     per table, fixed-width records sorted by the UTF-8 bytes of `ref_id`
+    strings     deduplicated UTF-8 string table
+
+Every record field is 8 bytes: text fields hold a (offset, length) reference into the string table,
+integer fields hold a signed 64-bit value. NULL is stored as `_NULL_STRING` or `_NULL_INT`.
+
+Compile from the repository root with `python -m sql.pack sql/object_init.db content.pack`.
+"""
+
+MAGIC = b"DGPK"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQQ")
+_DIRECTORY_ENTRY = struct.Struct("<IIIIIIIIQ")
+_STRING_REF = struct.Struct("<II")
+_INT = struct.Struct("<q")
+_FIELD_SIZE = 8
+
+_NULL_STRING = (0xFFFFFFFF, 0)
+_NULL_INT = -2**63
+
+class PackError(Exception):
+    """
+    Raises when a content pack cannot be compiled or read
+    """
+    pass
+
+class _StringTable:
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        self.offsets: dict[bytes, int] = {}
+
+    def add(self, value: Optional[str]) -> bytes:
+        if value is None:
+            return _STRING_REF.pack(*_NULL_STRING)
+
+        encoded = value.encode("utf-8")
+        offset = self.offsets.get(encoded)
+        if offset is None:
+            offset = self.offsets[encoded] = self.buffer.tell()
+            self.buffer.write(encoded)
+        if offset + len(encoded) >= _NULL_STRING[0]:
+            raise PackError("String table exceeds 4 GiB")
+        return _STRING_REF.pack(offset, len(encoded))
+
+def compile_pack(entry: DataEntry, path: str) -> dict[str, int]:
+    """
+    Compiles every content table of `entry`'s database into a pack at `path`.
+    Returns the number of records written per table.
+    """
+    strings = _StringTable()
+    tables: list[tuple[bytes, bytes, bytes, int, bytes]] = []
+    counts: dict[str, int] = {}
+
+    for table, (columns, _) in ROW_BUILDERS.items():
+        schema = entry.catalog.schema(table)
+        kind_of = {schema.keys[key]: "i" if types == (int,) else "s" for key, types, _ in schema.checks}
+        kinds = "".join(kind_of[column] for column in columns)
+
+        # Binary search in the reader compares raw UTF-8 bytes, so records are sorted the same way
+        rows = sorted(entry.iter_read(table, columns=columns), key=lambda row: row[0].encode("utf-8"))
+        counts[table] = len(rows)
+        records = io.BytesIO()
+        for row in rows:
+            for kind, value in zip(kinds, row):
+                if kind == "s":
+                    if value is not None and not isinstance(value, str):
+                        raise PackError(f"{table}.{row[0]}: expected text, got {type(value).__name__}")
+                    records.write(strings.add(value))
+                else:
+                    if value is not None and not isinstance(value, int):
+                        raise PackError(f"{table}.{row[0]}: expected integer, got {type(value).__name__}")
+                    records.write(_INT.pack(_NULL_INT if value is None else value))
+
+        tables.append((strings.add(table), strings.add("\x1f".join(columns)), strings.add(kinds), len(rows), records.getvalue()))
+
+    records_offset = _HEADER.size + _DIRECTORY_ENTRY.size * len(tables)
+    strings_offset = records_offset + sum(len(records) for *_, records in tables)
+    string_data = strings.buffer.getvalue()
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(tables), strings_offset, len(string_data)))
+        offset = records_offset
+        for name, column_names, kinds, count, records in tables:
+            file.write(_DIRECTORY_ENTRY.pack(
+                *_STRING_REF.unpack(name), *_STRING_REF.unpack(column_names), *_STRING_REF.unpack(kinds), count, 0, offset
+            ))
+            offset += len(records)
+        for *_, records in tables:
+            file.write(records)
+        file.write(string_data)
+    os.replace(temp_path, path)
+
+    return counts
+
+class _PackTable:
+    """
+    Directory entry of a single table inside a pack
+    """
+    def __init__(self, columns: tuple[str, ...], kinds: str, count: int, offset: int):
+        self.columns = columns
+        self.kinds = kinds
+        self.count = count
+        self.offset = offset
+        self.width = _FIELD_SIZE * len(kinds)
+        self.record = struct.Struct("<" + "".join("II" if kind == "s" else "q" for kind in kinds))
+
+class ContentPack:
+    """
+    Read-only view over a compiled content pack.
+    The file is memory-mapped, so it loads almost instantly and its pages are shared between processes
+    through the page cache; records are only decoded when looked up.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            try:
+                self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # mmap refuses empty files
+                raise PackError(f"{path} is not a content pack") from None
+
+        try:
+            self._read_directory()
+        except BaseException as e:
+            self._mm.close()
+            if isinstance(e, (struct.error, UnicodeDecodeError, ValueError)):
+                raise PackError(f"{path} is not a valid content pack: {e}") from e
+            raise
+
+    def _read_directory(self) -> None:
+        try:
+            magic, version, count, strings_offset, strings_length = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            raise PackError(f"{self.path} is not a content pack") from None
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise PackError(f"{self.path} is not a version {FORMAT_VERSION} content pack")
+
+        if strings_offset + strings_length > len(self._mm):
+            raise PackError(f"{self.path} is truncated")
+
+        self._strings = strings_offset
+        self._tables: dict[str, _PackTable] = {}
+        for i in range(count):
+            fields = _DIRECTORY_ENTRY.unpack_from(self._mm, _HEADER.size + i * _DIRECTORY_ENTRY.size)
+            name, column_names, kinds = (self._string(fields[j], fields[j + 1]) for j in (0, 2, 4))
+            if name is None or column_names is None or kinds is None:
+                raise PackError(f"{self.path} has a corrupt table directory")
+            info = self._tables[name] = _PackTable(tuple(column_names.split("\x1f")), kinds, fields[6], fields[8])
+            if info.offset + info.count * info.width > strings_offset:
+                raise PackError(f"{self.path} has a corrupt table directory")
+
+        self._decoders = {table: RowDecoder(table).layout(info.columns) for table, info in self._tables.items()}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    @property
+    def tables(self) -> tuple[str, ...]:
+        return tuple(self._tables)
+
+    def count(self, table: str) -> int:
+        return self._table(table).count
+
+    def columns(self, table: str) -> tuple[str, ...]:
+        return self._table(table).columns
+
+    def _table(self, table: str) -> _PackTable:
+        try:
+            return self._tables[table]
+        except KeyError:
+            raise ValueError(f"{table} not in list of accepted tables")
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if offset == _NULL_STRING[0]:
+            return None
+        start = self._strings + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _key(self, info: _PackTable, index: int) -> bytes:
+        offset, length = _STRING_REF.unpack_from(self._mm, info.offset + index * info.width)
+        start = self._strings + offset
+        return self._mm[start:start + length]
+
+    def _record(self, info: _PackTable, index: int) -> tuple:
+        fields = iter(info.record.unpack_from(self._mm, info.offset + index * info.width))
+        values: list[Any] = []
+        for kind in info.kinds:
+            if kind == "s":
+                values.append(self._string(next(fields), next(fields)))
+            else:
+                value = next(fields)
+                values.append(None if value == _NULL_INT else value)
+        return tuple(values)
+
+    def _find(self, info: _PackTable, ref_id: str) -> Optional[int]:
+        key = ref_id.encode("utf-8")
+        low, high = 0, info.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(info, middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < info.count and self._key(info, low) == key:
+            return low
+        return None
+
+    def row(self, table: str, ref_id: str) -> Optional[tuple]:
+        """
+        Returns the packed columns of a single record (see `columns`), or None if it does not exist
+        """
+        info = self._table(table)
+        index = self._find(info, ref_id)
+        return None if index is None else self._record(info, index)
+
+    def get(self, table: str, ref_id: str) -> Optional[Item]:
+        """
+        Returns the game object of a single record, or None if it does not exist
+        """
+        row = self.row(table, ref_id)
+        return None if row is None else self._decoders[table](row)
+
+    def __iter__(self) -> Iterator[tuple[str, Item]]:
+        for table, info in self._tables.items():
+            for index in range(info.count):
+                yield table, self._decoders[table](self._record(info, index))
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m sql.pack", description="Compile a content database into a content pack")
+    parser.add_argument("database")
+    parser.add_argument("output")
+    args = parser.parse_args(argv)
+
+    with DataEntry(args.database) as entry:
+        counts = compile_pack(entry, args.output)
+    for table, count in counts.items():
+        print(f"{table}: {count:,} records", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
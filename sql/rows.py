@@ -0,0 +1,68 @@
+from operator import itemgetter
+from typing import Any, Callable, Sequence
+from classes.metadata import Metadata
+from classes.items.item import Item, GenericUsable, Equippable
+
+"""
+Module that decodes rows of the content tables into game objects.
+"""
+
+# Columns each content table needs to build its objects, with the matching constructor
+ROW_BUILDERS: dict[str, tuple[tuple[str, ...], Callable[..., Item]]] = {
+    'item': (
+        ('ref_id', 'name', 'desc'),
+        lambda ref_id, name, desc: Item(Metadata(ref_id, name, desc))
+    ),
+    'usable': (
+        ('ref_id', 'name', 'desc', 'use_type', 'use_param'),
+        lambda ref_id, name, desc, use_type, use_param: GenericUsable(Metadata(ref_id, name, desc), use_type, use_param)
+    ),
+    'equip': (
+        ('ref_id', 'name', 'desc', 'element', 'attribute', 'skill', 'dual_wield'),
+        lambda ref_id, name, desc, element, attribute, skill, dual_wield:
+            Equippable(Metadata(ref_id, name, desc), element, attribute, skill, bool(dual_wield))
+    )
+}
+
+class RowDecoder:
+    """
+    Decodes rows of a single content table into its game objects.
+    The position of every needed column is resolved once per distinct column layout and reused for each row.
+    Instances can be used directly as a `sqlite3` row factory.
+    """
+    def __init__(self, table: str):
+        if table not in ROW_BUILDERS:
+            raise ValueError(f"{table} has no object decoder")
+
+        self.table = table
+        self.columns, self._build = ROW_BUILDERS[table]
+        self._layouts: dict[tuple[str, ...], Callable[[Sequence[Any]], Item]] = {}
+        self._last: tuple[Any, Any] = (None, None)
+
+    def __call__(self, cursor, row: tuple) -> Item:
+        # A cursor keeps the same description object for its whole result set
+        description, decode = self._last
+        if cursor.description is not description:
+            description = cursor.description
+            decode = self.layout(tuple(column[0] for column in description))
+            self._last = (description, decode)
+        return decode(row)
+
+    def layout(self, names: Sequence[str]) -> Callable[[Sequence[Any]], Item]:
+        """
+        Returns the decoding function for rows whose columns are `names`, in that order
+        """
+        names = tuple(names)
+        decode = self._layouts.get(names)
+        if decode is not None:
+            return decode
+
+        missing = [column for column in self.columns if column not in names]
+        if missing:
+            raise ValueError(f"Rows of {self.table} are missing columns {missing}")
+
+        pick = itemgetter(*(names.index(column) for column in self.columns))
+        build = self._build
+        decode = lambda row: build(*pick(row))
+        self._layouts[names] = decode
+        return decode
@@ -0,0 +1,229 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, TextIO
+from sql.entry import BatchResult, DataEntry
+
+"""
+Streaming import and export of content tables as CSV or JSONL.
+
+Rows use the same keys as `DataEntry.add` (e.g. `id`, `name`, `desc`), one row per CSV record or JSONL line.
+CSV cannot tell an empty string from NULL: empty fields of non-text columns import as NULL and NULL exports as an empty field.
+
+Usage, from the repository root:
+    python -m sql.transfer import item items.csv --chunk-size 5000
+    python -m sql.transfer import item items.csv --upsert
+    python -m sql.transfer export equip equips.jsonl
+"""
+
+FORMATS = ("csv", "jsonl")
+
+@dataclass
+class TransferStats:
+    """
+    Progress of an import or export
+    """
+    rows: int = 0
+    elapsed: float = 0.0
+    result: BatchResult = field(default_factory=BatchResult)
+
+    @property
+    def throughput(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+Progress = Callable[[TransferStats], None]
+
+def detect_format(path: str, file_format: Optional[str] = None) -> str:
+    """
+    Returns `file_format`, or the format implied by the extension of `path`
+    """
+    file_format = file_format or path.rsplit(".", 1)[-1].lower()
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format {file_format!r}; expected one of {FORMATS}")
+    return file_format
+
+# A parsed record: the raw record, then either its row or the error that kept it from parsing
+Record = tuple[Any, Optional[dict[str, Any]], Optional[Exception]]
+
+def _csv_rows(file: TextIO, converters: dict[str, Callable[[str], Any]]) -> Iterator[Record]:
+    for record in csv.DictReader(file):
+        try:
+            yield record, {key: converters[key](value) if key in converters else value for key, value in record.items()}, None
+        except (ValueError, TypeError) as e:
+            yield record, None, e
+
+def _jsonl_rows(file: TextIO) -> Iterator[Record]:
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line, None, e
+            continue
+        if isinstance(row, dict):
+            yield line, row, None
+        else:
+            yield line, None, ValueError(f"expected a JSON object, got {type(row).__name__}")
+
+def _parsed(records: Iterable[Record], failures: list[tuple[int, Any, Exception]]) -> Iterator[dict[str, Any]]:
+    """
+    Yields the row of every record that parsed, recording the others with their position in `failures`
+    """
+    for i, (record, row, error) in enumerate(records):
+        if error is not None:
+            failures.append((i, record, error))
+        else:
+            yield row
+
+def _csv_converters(entry: DataEntry, table: str) -> dict[str, Callable[[str], Any]]:
+    """
+    Converters from CSV text to the type of every non-text column of `table`
+    """
+    converters: dict[str, Callable[[str], Any]] = {}
+    for key, types, _ in entry.catalog.schema(table).checks:
+        if types is None or str in types:
+            continue
+        cast = types[-1]
+        converters[key] = lambda value, cast=cast: None if value == "" else cast(value)
+    return converters
+
+def _tracked(
+        rows: Iterable[Any],
+        stats: TransferStats,
+        start: float,
+        progress: Optional[Progress],
+        every: int
+    ) -> Iterator[Any]:
+    for row in rows:
+        yield row
+        stats.rows += 1
+        if progress is not None and stats.rows % every == 0:
+            stats.elapsed = time.perf_counter() - start
+            progress(stats)
+
+def _record_position(position: int, skipped: list[int]) -> int:
+    for i in skipped:
+        if i > position:
+            break
+        position += 1
+    return position
+
+def import_rows(
+        entry: DataEntry,
+        table: str,
+        file: TextIO,
+        file_format: str,
+        chunk_size: int = 1000,
+        progress: Optional[Progress] = None,
+        progress_every: int = 100_000,
+        upsert: bool = False
+    ) -> TransferStats:
+    """
+    Streams rows from `file` into `table`, committing every `chunk_size` rows.
+    Only one chunk is held in memory at a time; records that fail to parse or to write are reported
+    in `stats.result.failures` by their record position (skipping blank JSONL lines), and the import carries on.
+    `upsert` updates rows whose `ref_id` already exists instead of reporting them as failures.
+    """
+    if file_format == "csv":
+        records = _csv_rows(file, _csv_converters(entry, table))
+    else:
+        records = _jsonl_rows(file)
+
+    stats = TransferStats()
+    start = time.perf_counter()
+    unparsed: list[tuple[int, Any, Exception]] = []
+    rows = _parsed(_tracked(records, stats, start, progress, progress_every), unparsed)
+    write = entry.upsert_many if upsert else entry.add_many
+    result = write(table, rows, chunk_size)
+
+    # Positions of write failures only count the rows that parsed, so shift them past the records skipped before
+    skipped = [i for i, *_ in unparsed]
+    failures = [(_record_position(i, skipped), row, error) for i, row, error in result.failures]
+    result.failures = sorted(failures + unparsed, key=lambda failure: failure[0])
+    stats.result = result
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+def export_rows(
+        entry: DataEntry,
+        table: str,
+        file: TextIO,
+        file_format: str,
+        batch_size: int = 1000,
+        progress: Optional[Progress] = None,
+        progress_every: int = 100_000
+    ) -> TransferStats:
+    """
+    Streams every row of `table` into `file`, reading `batch_size` rows at a time
+    """
+    keys = entry.catalog.schema(table).keys
+    columns = list(keys.values())
+
+    stats = TransferStats()
+    start = time.perf_counter()
+    rows = (dict(zip(keys, row)) for row in entry.iter_read(table, batch_size, columns))
+
+    if file_format == "csv":
+        writer = csv.DictWriter(file, fieldnames=list(keys))
+        writer.writeheader()
+        for row in _tracked(rows, stats, start, progress, progress_every):
+            writer.writerow(row)
+    else:
+        for row in _tracked(rows, stats, start, progress, progress_every):
+            file.write(json.dumps(row, ensure_ascii=False))
+            file.write("\n")
+
+    stats.elapsed = time.perf_counter() - start
+    stats.result.written = stats.rows
+    return stats
+
+def report(stats: TransferStats) -> None:
+    """
+    Prints the progress of `stats` to stderr; usable as the `progress` callback of `import_rows` and `export_rows`
+    """
+    print(f"{stats.rows:,} rows in {stats.elapsed:.1f}s ({stats.throughput:,.0f} rows/s)", file=sys.stderr)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m sql.transfer", description="Streaming import/export of content tables")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("table")
+    parser.add_argument("file", help="CSV or JSONL file, or - for stdin/stdout")
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the file extension")
+    parser.add_argument("--db", help="database path, defaults to sql/object_init.db")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per commit (import) or fetch (export)")
+    parser.add_argument("--profile", default="default", help="pragma profile, e.g. bulk-import")
+    parser.add_argument("--progress-every", type=int, default=100_000, help="rows between progress reports")
+    parser.add_argument("--upsert", action="store_true", help="update rows whose ref_id already exists (import)")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.file == "-" and args.format is None:
+        parser.error("--format is required when streaming through stdin/stdout")
+    file_format = detect_format(args.file, args.format)
+    progress = None if args.quiet else report
+
+    with DataEntry(args.db, profile=args.profile) as entry:
+        if args.command == "import":
+            file = sys.stdin if args.file == "-" else open(args.file, newline="", encoding="utf-8")
+            with file:
+                stats = import_rows(
+                    entry, args.table, file, file_format, args.chunk_size, progress, args.progress_every, args.upsert
+                )
+        else:
+            file = sys.stdout if args.file == "-" else open(args.file, "w", newline="", encoding="utf-8")
+            with file:
+                stats = export_rows(entry, args.table, file, file_format, args.chunk_size, progress, args.progress_every)
+
+    if not args.quiet:
+        report(stats)
+    for i, _, error in stats.result.failures:
+        print(f"row {i}: {error}", file=sys.stderr)
+    return 1 if stats.result.failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from itertools import count, islice
+from typing import Any, Callable, Hashable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sql.interface import SQLInterface
+
+"""
+Module that contains the write-behind queue of `SQLInterface`.
+"""
+
+Write = tuple[str, Any, Optional[Hashable]]
+
+class WriteBehindError(Exception):
+    """
+    Raises from a durability barrier when queued writes failed since the previous one.
+    `failures` holds the request, the data, and the error of every failed write.
+    """
+    def __init__(self, failures: list[tuple[str, Any, Exception]]):
+        super().__init__(f"{len(failures)} queued writes failed, first: {failures[0][2]!r}")
+        self.failures = failures
+
+@dataclass(frozen=True)
+class WriteBehindPolicy:
+    """
+    When queued writes are flushed: as soon as `batch_size` are waiting, or `interval` seconds after the first one arrived.
+    Submitting blocks while `max_pending` writes are waiting.
+    """
+    batch_size: int = 500
+    interval: float = 0.05
+    max_pending: int = 10_000
+
+    def __post_init__(self):
+        if self.batch_size < 1 or self.max_pending < 1 or self.interval < 0:
+            raise ValueError(f"Invalid write-behind policy {self}")
+
+@dataclass(frozen=True)
+class WriteBehindStats:
+    """
+    Snapshot of a write-behind queue's counters.
+    Flush times cover writing and committing one batch.
+    """
+    pending: int
+    submitted: int
+    coalesced: int
+    written: int
+    failed: int
+    flushes: int
+    last_flush_time: float
+    max_flush_time: float
+    total_flush_time: float
+
+    @property
+    def mean_flush_time(self) -> float:
+        return self.total_flush_time / self.flushes if self.flushes else 0.0
+
+class WriteBehind:
+    """
+    Queue of modifications applied in the background by a single writer thread, one transaction per batch.
+    A write submitted with a `key` identifies the row it writes. It replaces the latest queued, not yet written write
+    of that row in place when both use the same request and no write without a key was queued since;
+    otherwise it is queued after it. Writes without a key are never coalesced and are barriers to coalescing.
+    A batch that fails is retried one write at a time, so one bad write never drops the others.
+    Failed writes, and listeners that raise, are reported by the next barrier.
+
+    The thread starts on the first submit and stops on `close()`; the queue stays usable afterwards.
+    """
+    def __init__(self, database: "SQLInterface", policy: WriteBehindPolicy = WriteBehindPolicy()):
+        self.database = database
+        self.policy = policy
+
+        self._cond = threading.Condition()
+        self._pending: dict[int, tuple[int, str, Any, Optional[Hashable]]] = {}
+        self._latest: dict[Hashable, int] = {}
+        self._sequence = count(1)
+        self._last_sequence = 0
+        self._barrier = 0
+        self._writing: Optional[int] = None
+        self._urgent = 0
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._failures: list[tuple[str, Any, Exception]] = []
+        self._listeners: list[Callable[[list[Write]], None]] = []
+
+        self._submitted = 0
+        self._coalesced = 0
+        self._written = 0
+        self._failed = 0
+        self._flushes = 0
+        self._last_flush_time = 0.0
+        self._max_flush_time = 0.0
+        self._total_flush_time = 0.0
+
+    def subscribe(self, listener: Callable[[list[Write]], None]) -> None:
+        """
+        Calls `listener` on the writer thread with every batch of (request, data, key) writes once it is committed
+        """
+        self._listeners.append(listener)
+
+    def submit(self, request: str, data: Any = {}, key: Optional[Hashable] = None) -> None:
+        """
+        Queues a modification, blocking while the queue is full
+        """
+        if isinstance(data, dict):
+            data = dict(data)
+
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._pending) < self.policy.max_pending)
+            self._submitted += 1
+            sequence = self._last_sequence = next(self._sequence)
+            if key is None:
+                self._barrier = sequence
+            else:
+                # Replacing the latest write of the row in place only keeps the order if nothing else may have touched it since
+                latest = self._latest.get(key)
+                if latest is not None and latest > self._barrier and self._pending[latest][1] == request:
+                    self._pending[latest] = (latest, request, data, key)
+                    self._coalesced += 1
+                    return
+                self._latest[key] = sequence
+            self._pending[sequence] = (sequence, request, data, key)
+
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """
+        Durability barrier: waits until every write submitted before the call is committed.
+        Raises `WriteBehindError` if any queued write failed since the previous barrier.
+        """
+        with self._cond:
+            target = self._last_sequence
+            self._urgent += 1
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(lambda: self._flushed(target))
+            finally:
+                self._urgent -= 1
+            failures, self._failures = self._failures, []
+
+        if failures:
+            raise WriteBehindError(failures)
+
+    def _flushed(self, target: int) -> bool:
+        if self._writing is not None and self._writing <= target:
+            return False
+        return all(entry[0] > target for entry in self._pending.values())
+
+    def close(self) -> None:
+        """
+        Flushes every queued write, then stops the writer thread
+        """
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                thread, self._thread = self._thread, None
+                self._stopping = True
+                self._cond.notify_all()
+            if thread is not None:
+                thread.join()
+
+    def stats(self) -> WriteBehindStats:
+        with self._cond:
+            return WriteBehindStats(
+                len(self._pending), self._submitted, self._coalesced, self._written, self._failed,
+                self._flushes, self._last_flush_time, self._max_flush_time, self._total_flush_time
+            )
+
+    def _next_batch(self) -> Optional[list[tuple[int, str, Any, Optional[Hashable]]]]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._stopping)
+            if not self._pending:
+                return None
+
+            # Give the batch `interval` to fill up, unless it is already full or someone waits on a barrier
+            self._cond.wait_for(
+                lambda: len(self._pending) >= self.policy.batch_size or self._urgent or self._stopping,
+                timeout=self.policy.interval
+            )
+
+            batch = [self._pending.pop(sequence) for sequence in list(islice(self._pending, self.policy.batch_size))]
+            for sequence, _, _, key in batch:
+                if key is not None and self._latest.get(key) == sequence:
+                    del self._latest[key]
+            self._writing = min(sequence for sequence, *_ in batch)
+            self._cond.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        batch = None
+        try:
+            with closing(self.database.connect()) as conn:
+                while (batch := self._next_batch()) is not None:
+                    self._apply(conn, batch)
+                    batch = None
+        except Exception as e:
+            # The writer cannot carry on, so the writes it still holds fail instead of waiting forever
+            with self._cond:
+                lost = list(batch or ()) + list(self._pending.values())
+                self._pending.clear()
+                self._latest.clear()
+                self._failures.extend((request, data, e) for _, request, data, _ in lost)
+                self._failed += len(lost)
+        finally:
+            with self._cond:
+                self._writing = None
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                self._cond.notify_all()
+
+    def _apply(self, conn: sqlite3.Connection, batch: list[tuple[int, str, Any, Optional[Hashable]]]) -> None:
+        start = time.perf_counter()
+        failures = self._write(conn, batch)
+        elapsed = time.perf_counter() - start
+
+        written = [(request, data, key) for _, request, data, key in batch]
+        listener_failures = []
+        for listener in self._listeners:
+            try:
+                listener(written)
+            except Exception as e:
+                listener_failures.append((f"listener {getattr(listener, '__qualname__', listener)!r}", written, e))
+
+        with self._cond:
+            self._writing = None
+            self._failures.extend(failures + listener_failures)
+            self._written += len(batch) - len(failures)
+            self._failed += len(failures)
+            self._flushes += 1
+            self._last_flush_time = elapsed
+            self._max_flush_time = max(self._max_flush_time, elapsed)
+            self._total_flush_time += elapsed
+            self._cond.notify_all()
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, batch: list[tuple[int, str, Any, Optional[Hashable]]]) -> list[tuple[str, Any, Exception]]:
+        # Any error is caught, not only sqlite3.Error: binding a value may raise e.g. OverflowError
+        try:
+            with conn:
+                for _, request, data, _ in batch:
+                    conn.execute(request, data)
+            return []
+        except Exception:
+            pass
+
+        failures = []
+        for _, request, data, _ in batch:
+            try:
+                with conn:
+                    conn.execute(request, data)
+            except Exception as e:
+                failures.append((request, data, e))
+        return failures
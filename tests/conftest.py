@@ -0,0 +1,13 @@
+import shutil
+import pytest
+
+TEST_DB_PATH = "tests/test_object_init.db"
+
+@pytest.fixture
+def temp_db(tmp_path) -> str:
+    """
+    Path to a throwaway copy of the test database, for tests that alter the schema
+    """
+    path = tmp_path / "object_init.db"
+    shutil.copyfile(TEST_DB_PATH, path)
+    return str(path)
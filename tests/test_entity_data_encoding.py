@@ -0,0 +1,86 @@
+import pytest
+from classes.data.attributes import AttributeModifier
+from classes.data.encoding import (
+    _parse_attribute, encode_attribute, encode_params, encode_skills, parse_attribute, parse_params, parse_skills
+)
+from classes.items.item import Equippable, GenericUsable
+from classes.metadata import Metadata
+
+def test_parse_attribute():
+    mod = parse_attribute("str=+5;spd=-2;LCK=3")
+    assert mod.isinteger
+    assert (mod.strength, mod.defense, mod.speed, mod.luck) == (5, 0, -2, 3)
+
+    mod = parse_attribute("str=+10%; dex = -2.5%")
+    assert mod.isfractional
+    assert (mod.strength, mod.dexterity) == (0.1, -0.025)
+
+    assert parse_attribute(None) is None
+    assert parse_attribute("") is None
+
+@pytest.mark.parametrize("text", ["str", "foo=1", "str=1;str=2", "str=1;def=2%", "str=1.5", "str=x%"])
+def test_parse_attribute_invalid(text):
+    with pytest.raises(ValueError):
+        parse_attribute(text)
+
+def test_parse_attribute_memoized():
+    _parse_attribute.cache_clear()
+    first = parse_attribute("def=+3")
+    second = parse_attribute("def=+3")
+    assert _parse_attribute.cache_info().hits == 1
+
+    # Every call gets its own modifier, so mutating one never leaks into the next
+    assert first is not second
+    first += AttributeModifier(defense=1)
+    assert (first.defense, second.defense, parse_attribute("def=+3").defense) == (4, 3, 3)
+
+def test_encode_attribute_round_trip():
+    for mod in (AttributeModifier(strength=5, speed=-2), AttributeModifier(luck=0.15, accuracy=-0.2, frac=True)):
+        text = encode_attribute(mod)
+        parsed = parse_attribute(text)
+        assert repr(parsed) == repr(mod)
+        assert encode_attribute(parsed) == text
+
+    assert encode_attribute(AttributeModifier(defense=3, strength=1)) == "str=+1;def=+3"
+    assert encode_attribute(None) == ""
+
+    # Percentages keep every significant digit, not only the first six
+    text = "str=+12.3456789%;lck=-0.000123456789%"
+    parsed = parse_attribute(text)
+    assert encode_attribute(parsed) == text
+    assert repr(parse_attribute(encode_attribute(parsed))) == repr(parsed)
+    assert encode_attribute(parse_attribute("spd=+12.5%")) == "spd=+12.5%"
+
+def test_skills():
+    assert parse_skills("slash, parry") == ("slash", "parry")
+    assert parse_skills(None) == parse_skills("") == ()
+    assert encode_skills(parse_skills("slash, parry")) == "slash,parry"
+    with pytest.raises(ValueError):
+        parse_skills("slash,,parry")
+    with pytest.raises(ValueError):
+        encode_skills(["a,b"])
+
+def test_params():
+    params = parse_params("amount=50;ratio=0.5;target=self;label=")
+    assert params == (("amount", 50), ("ratio", 0.5), ("target", "self"), ("label", ""))
+    assert parse_params(encode_params(params)) == params
+    assert encode_params({'amount': 50, 'target': "self"}) == "amount=50;target=self"
+    assert parse_params(None) == ()
+
+    with pytest.raises(ValueError):
+        parse_params("amount=1;amount=2")
+    with pytest.raises(ValueError):
+        parse_params("not valid=1")
+    with pytest.raises(ValueError):
+        encode_params({'amount': "50"})
+    with pytest.raises(TypeError):
+        encode_params({'flag': True})
+
+def test_item_properties():
+    equip = Equippable(Metadata("sword", "Sword", "desc"), "fire", "str=+5", "slash,parry")
+    assert equip.attr_mod.strength == 5
+    assert equip.skill_set == ("slash", "parry")
+    assert Equippable(Metadata("stick", "Stick", "desc")).attr_mod is None
+
+    usable = GenericUsable(Metadata("potion", "Potion", "desc"), "heal", "amount=50")
+    assert dict(usable.effect_parameter) == {'amount': 50}
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+import pytest
+from sql.async_entry import AsyncDataEntry
+from sql.entry import DataEntry
+
+def fill_items(path: str, count: int) -> None:
+    with DataEntry(path) as entry:
+        entry.add_many('item', ({'id': f"async_{i}", 'name': f"name_{i}", 'desc': "x" * 100} for i in range(count)))
+
+async def max_tick_gap(task: asyncio.Future, interval: float = 0.005) -> float:
+    """
+    Ticks the event loop until `task` finishes and returns the longest delay between ticks
+    """
+    worst = 0.0
+    last = time.perf_counter()
+    while not task.done():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        worst = max(worst, now - last - interval)
+        last = now
+    return worst
+
+def test_async_round_trip(temp_db):
+    async def main():
+        async with AsyncDataEntry(temp_db) as entry:
+            data = {'id': "async_item", 'name': "name", 'desc': "desc"}
+            await entry.add('item', data)
+            assert (await entry.get('item', "async_item"))[1:] == ("async_item", "name", "desc")
+
+            await entry.update('item', "async_item", {'id': "async_item2", 'name': "name2", 'desc': "desc"})
+            assert await entry.get('item', "async_item") is None
+            assert (await entry.get('item', "async_item2"))[2] == "name2"
+
+            assert ('item',) in await entry.query_table_list()
+            assert ('ref_id', 'TEXT') in await entry.query_table_schema('item')
+            assert len(await entry.read('item')) == len(DataEntry(temp_db).read('item'))
+
+            with pytest.raises(ValueError):
+                await entry.get('invalid_table', "null")
+
+    asyncio.run(main())
+
+def test_async_writes_serialize(temp_db):
+    async def main():
+        async with AsyncDataEntry(temp_db) as entry:
+            writers = set()
+            original = entry.entry.add
+
+            def tracked_add(*args):
+                writers.add(threading.current_thread().name)
+                original(*args)
+
+            entry.entry.add = tracked_add
+            await asyncio.gather(*(
+                entry.add('item', {'id': f"w_{i}", 'name': "n", 'desc': "d"}) for i in range(50)
+            ))
+            assert len(writers) == 1
+            assert all([await entry.get('item', f"w_{i}") for i in range(50)])
+
+    asyncio.run(main())
+
+def test_async_reads_overlap(temp_db):
+    async def main():
+        async with AsyncDataEntry(temp_db, readers=4) as entry:
+            active = 0
+            peak = 0
+            lock = threading.Lock()
+            original = entry.entry.read
+
+            def slow_read(table):
+                nonlocal active, peak
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.05)
+                with lock:
+                    active -= 1
+                return original(table)
+
+            entry.entry.read = slow_read
+            await asyncio.gather(*(entry.read('item') for _ in range(4)))
+            assert peak > 1
+
+    asyncio.run(main())
+
+def test_async_loop_responsive_during_large_read(temp_db):
+    fill_items(temp_db, 200_000)
+
+    async def main():
+        async with AsyncDataEntry(temp_db) as entry:
+            start = time.perf_counter()
+            read = asyncio.ensure_future(entry.read('item'))
+            gap = await max_tick_gap(read)
+            elapsed = time.perf_counter() - start
+
+            assert len(await read) >= 200_000
+            # The loop kept ticking while the read ran, instead of stalling for its whole duration
+            assert gap < max(0.1, elapsed / 2)
+
+    asyncio.run(main())
+
+def test_async_invalid_options():
+    with pytest.raises(ValueError):
+        AsyncDataEntry(readers=0)
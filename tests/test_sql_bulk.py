@@ -0,0 +1,75 @@
+import pytest
+import sqlite3
+from classes.utils.randgen import randstr
+from sql.entry import DataEntry, SchemaError
+
+def make_items(count: int, prefix: str = "bulk") -> list[dict]:
+    return [{'id': f"{prefix}_{i}", 'name': randstr(10), 'desc': randstr(50)} for i in range(count)]
+
+def test_add_many(temp_db):
+    with DataEntry(temp_db) as entry:
+        before = len(entry.read('item'))
+        rows = make_items(2500)
+
+        result = entry.add_many('item', iter(rows), chunk_size=1000)
+        assert result.ok
+        assert result.written == 2500
+        assert len(entry.read('item')) == before + 2500
+        assert entry.get('item', 'bulk_1234')[2] == rows[1234]['name']
+
+def test_add_many_reports_failures(temp_db):
+    with DataEntry(temp_db) as entry:
+        rows = make_items(10)
+        rows[3]['id'] = rows[2]['id']           # Duplicate ref_id
+        rows[7] = {'id': 'bad', 'name': 'bad'}  # Missing column
+
+        result = entry.add_many('item', rows, chunk_size=4)
+        assert not result.ok
+        assert result.written == 8
+        assert [i for i, _, _ in result.failures] == [3, 7]
+        assert isinstance(result.failures[0][2], sqlite3.IntegrityError)
+        assert isinstance(result.failures[1][2], SchemaError)
+
+        # The rest of the failing chunk still went through
+        assert entry.get('item', rows[2]['id']) is not None
+        assert entry.get('item', rows[9]['id']) is not None
+
+def test_add_many_invalid_table(temp_db):
+    with DataEntry(temp_db) as entry:
+        with pytest.raises(ValueError):
+            entry.add_many('invalid_table', make_items(1))
+        with pytest.raises(ValueError):
+            entry.add_many('item', make_items(1), chunk_size=0)
+
+def test_update_many(temp_db):
+    with DataEntry(temp_db) as entry:
+        rows = make_items(20)
+        entry.add_many('item', rows)
+
+        # Rename every row and change its name
+        updates = {row['id']: {'id': row['id'] + "_new", 'name': "renamed", 'desc': row['desc']} for row in rows}
+        result = entry.update_many('item', updates, chunk_size=7)
+        assert result.ok
+        assert result.written == 20
+
+        for row in rows:
+            assert entry.get('item', row['id']) is None
+            assert entry.get('item', row['id'] + "_new")[2] == "renamed"
+
+def test_update_many_reports_missing_rows(temp_db):
+    with DataEntry(temp_db) as entry:
+        rows = make_items(3)
+        entry.add_many('item', rows)
+
+        updates = [(row['id'], {**row, 'name': "updated"}) for row in rows]
+        updates.insert(1, ("missing_ref_id", {'id': "missing_ref_id", 'name': "updated", 'desc': "desc"}))
+        result = entry.update_many('item', updates, chunk_size=2)
+        assert result.written == 3
+        assert [(i, type(error)) for i, _, error in result.failures] == [(1, LookupError)]
+        assert entry.get('item', "missing_ref_id") is None
+        assert all(entry.get('item', row['id'])[2] == "updated" for row in rows)
+
+        # Rows that fail a constraint and rows that match nothing are told apart in the row by row retry
+        result = entry.update_many('item', [(rows[0]['id'], {**rows[1]}), ("missing_ref_id", {**rows[2]})])
+        assert result.written == 0
+        assert [type(error) for _, _, error in result.failures] == [sqlite3.IntegrityError, LookupError]
@@ -0,0 +1,74 @@
+import pytest
+from sql.cache import LRUCache
+from sql.entry import DataEntry
+
+def test_lru_eviction():
+    cache = LRUCache(2)
+    cache.put('a', 1, cache.token())
+    cache.put('b', 2, cache.token())
+    assert cache.get('a') == 1
+
+    # 'b' is the least recently used entry
+    cache.put('c', 3, cache.token())
+    assert 'b' not in cache
+    assert cache.get('b') is LRUCache.MISSING
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.size, stats.capacity) == (1, 1, 1, 2, 2)
+    assert stats.hit_rate == 0.5
+
+    cache.reset_stats()
+    assert cache.stats.hits == 0
+
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+def test_lru_stale_put_rejected():
+    cache = LRUCache(4)
+    token = cache.token()
+    cache.invalidate('a')
+    assert not cache.put('a', "stale", token)
+    assert 'a' not in cache
+
+def test_entry_get_cached(temp_db):
+    with DataEntry(temp_db, cache_size=16) as entry:
+        data = {'id': "cached_item", 'name': "name", 'desc': "desc"}
+
+        # Missing rows are cached too, and adding the row invalidates them
+        assert entry.get('item', "cached_item") is None
+        entry.add('item', data)
+        row = entry.get('item', "cached_item")
+        assert row[1:] == ("cached_item", "name", "desc")
+        assert entry.get('item', "cached_item") == row
+        assert entry.cache.stats.hits == 1
+
+        # Hits never touch the database
+        entry.database.db_query = lambda *_: pytest.fail("cache hit queried the database")
+        assert entry.get('item', "cached_item") == row
+
+def test_entry_cache_rename(temp_db):
+    with DataEntry(temp_db, cache_size=16) as entry:
+        entry.add('item', {'id': "old_name", 'name': "name", 'desc': "desc"})
+        assert entry.get('item', "old_name") is not None
+        assert entry.get('item', "new_name") is None
+
+        entry.update('item', "old_name", {'id': "new_name", 'name': "renamed", 'desc': "desc"})
+        assert entry.get('item', "old_name") is None
+        assert entry.get('item', "new_name")[2] == "renamed"
+
+def test_entry_cache_bulk_invalidation(temp_db):
+    with DataEntry(temp_db, cache_size=4) as entry:
+        ids = [f"bulk_{i}" for i in range(8)]
+        for ref_id in ids:
+            assert entry.get('item', ref_id) is None
+        assert entry.cache.stats.evictions == 4
+
+        entry.add_many('item', [{'id': ref_id, 'name': ref_id, 'desc': "d"} for ref_id in ids])
+        assert all(entry.get('item', ref_id) is not None for ref_id in ids)
+
+        entry.update_many('item', {ids[-1]: {'id': "renamed", 'name': "renamed", 'desc': "d"}})
+        assert entry.get('item', ids[-1]) is None
+        assert entry.get('item', "renamed") is not None
+
+def test_entry_cache_disabled():
+    assert DataEntry().cache is None
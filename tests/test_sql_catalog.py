@@ -0,0 +1,107 @@
+import re
+import pytest
+from sql.catalog import SchemaError, TableCatalog
+from sql.entry import DataEntry
+from sql.lookup import lookup, LookupKey
+from sql.interface import SQLInterface
+
+def test_catalog_tables(temp_db):
+    with SQLInterface(temp_db) as inter:
+        catalog = TableCatalog(inter)
+        assert {'item', 'usable', 'equip'} <= catalog.tables
+        assert 'sqlite_sequence' not in catalog.tables
+        assert catalog.verify('item')
+
+        with pytest.raises(ValueError):
+            catalog.verify('invalid')
+
+def test_catalog_hit_skips_database(temp_db):
+    with SQLInterface(temp_db) as inter:
+        catalog = TableCatalog(inter)
+        assert 'item' in catalog
+
+        # Hits are answered from memory
+        catalog.schema_version = lambda: pytest.fail("schema version queried on a cache hit")
+        assert 'item' in catalog
+
+def test_catalog_schema_change(temp_db):
+    with DataEntry(temp_db) as entry:
+        assert 'extra' not in entry.catalog
+
+        # Tables created after the first load are picked up through the schema version
+        entry.database.db_modify("CREATE TABLE extra (ref_id TEXT);")
+        assert 'extra' in entry.catalog
+        assert entry.read('extra') == []
+
+def test_catalog_scoped_to_database(temp_db):
+    with DataEntry(temp_db) as entry:
+        entry.database.db_modify("CREATE TABLE custom_only (ref_id TEXT);")
+
+        # Lookup validates against the entry's own database, not the default one
+        assert entry.read('custom_only') == []
+        with pytest.raises(ValueError):
+            DataEntry().read('custom_only')
+
+def test_catalog_schema_keys(temp_db):
+    with SQLInterface(temp_db) as inter:
+        catalog = TableCatalog(inter)
+        assert set(catalog.schema('item').keys) == {'id', 'name', 'desc'}
+        assert set(catalog.schema('usable').keys) == {'id', 'name', 'desc', 'use_type', 'use_param'}
+        assert dict(catalog.schema('equip').keys) == {
+            'id': 'ref_id', 'name': 'name', 'desc': 'desc', 'element': 'element',
+            'attribute': 'attribute', 'skill': 'skill', 'is_dual_wield': 'dual_wield'
+        }
+        assert catalog.columns('item') == ('item_id', 'ref_id', 'name', 'desc')
+        assert catalog.schema('item') is catalog.schema('item')
+
+def test_catalog_statements_match_schema(temp_db):
+    # The hand-written statements must bind exactly the keys the real tables accept
+    with SQLInterface(temp_db) as inter:
+        catalog = TableCatalog(inter)
+        for table in ('item', 'usable', 'equip'):
+            keys = set(catalog.schema(table).keys)
+            assert set(re.findall(r":(\w+)", lookup(LookupKey.SQL_CREATE, table, catalog))) == keys
+            assert set(re.findall(r":(\w+)", lookup(LookupKey.SQL_UPDATE, table, catalog))) == keys | {'old_id'}
+
+def test_catalog_type_validation(temp_db):
+    with DataEntry(temp_db) as entry:
+        equip = {
+            'id': "typed", 'name': "name", 'desc': "desc", 'element': None,
+            'attribute': None, 'skill': None, 'is_dual_wield': True
+        }
+        assert entry.verify_schema('equip', equip)
+
+        with pytest.raises(SchemaError):
+            entry.verify_schema('equip', {**equip, 'is_dual_wield': "yes"})
+        with pytest.raises(SchemaError):
+            entry.verify_schema('equip', {**equip, 'name': None})
+        with pytest.raises(SchemaError):
+            entry.add('item', {'id': 5, 'name': "name", 'desc': "desc"})
+
+def test_catalog_equip_update(temp_db):
+    with DataEntry(temp_db) as entry:
+        equip = {
+            'id': "equip_update", 'name': "name", 'desc': "desc", 'element': "fire",
+            'attribute': "old", 'skill': "skill", 'is_dual_wield': 0
+        }
+        entry.add('equip', equip)
+        entry.update('equip', "equip_update", {**equip, 'attribute': "new", 'is_dual_wield': 1})
+        assert entry.get('equip', "equip_update")[5:] == ("new", "skill", 1)
+
+def test_catalog_schema_reload(temp_db):
+    with DataEntry(temp_db) as entry:
+        values = {'id': "altered", 'name': "name", 'desc': "desc"}
+        assert entry.verify_schema('item', values)
+
+        entry.database.db_modify("ALTER TABLE item ADD COLUMN rarity INTEGER;")
+        entry.add('item', {**values, 'rarity': 3})
+        assert entry.catalog.columns('item')[-1] == "rarity"
+        assert entry.get('item', "altered")[-1] == 3
+
+        # Updates and upserts write the new column too
+        entry.update('item', "altered", {**values, 'rarity': 4})
+        assert entry.get('item', "altered")[-1] == 4
+        entry.upsert('item', {**values, 'rarity': 5})
+        assert entry.get('item', "altered")[-1] == 5
+        with pytest.raises(SchemaError):
+            entry.verify_schema('item', values)
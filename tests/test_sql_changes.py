@@ -0,0 +1,103 @@
+import pytest
+import sqlite3
+from sql.changes import ChangeWatcher, prune
+from sql.entry import DataEntry
+from sql.instantiator import Instantiator
+from sql.migrations import MigrationError
+
+@pytest.fixture
+def migrated_db(temp_db) -> str:
+    with DataEntry(temp_db) as entry:
+        entry.migrate()
+    return temp_db
+
+def test_watcher_reports_ref_ids(migrated_db):
+    with DataEntry(migrated_db) as entry, ChangeWatcher(entry.database) as watcher:
+        assert not watcher.poll()
+
+        entry.add('item', {'id': "watch_new", 'name': "new", 'desc': "d"})
+        key = entry.read('usable')[0][1]
+        entry.update('usable', key, {'id': "watch_renamed", 'name': "renamed", 'desc': "d", 'use_type': None, 'use_param': None})
+
+        changes = watcher.poll()
+        assert changes.complete
+        assert dict(changes.rows) == {'item': {"watch_new"}, 'usable': {key, "watch_renamed"}}
+
+        # Every change is reported once
+        assert not watcher.poll()
+
+        entry.database.db_modify("DELETE FROM item WHERE ref_id = :key;", {'key': "watch_new"})
+        assert dict(watcher.poll().rows) == {'item': {"watch_new"}}
+
+def test_watcher_sees_other_writers(migrated_db):
+    with ChangeWatcher(DataEntry(migrated_db).database) as watcher:
+        with DataEntry(migrated_db) as other:
+            with other.transaction():
+                other.add('equip', {
+                    'id': "watch_equip", 'name': "e", 'desc': "d", 'element': None,
+                    'attribute': None, 'skill': None, 'is_dual_wield': 0
+                })
+                assert not watcher.poll()
+        assert dict(watcher.poll().rows) == {'equip': {"watch_equip"}}
+
+def test_watcher_pruned(migrated_db):
+    with DataEntry(migrated_db) as entry, ChangeWatcher(entry.database) as watcher:
+        entry.add('item', {'id': "watch_1", 'name': "n", 'desc': "d"})
+        entry.add('item', {'id': "watch_2", 'name': "n", 'desc': "d"})
+        assert prune(entry.database, ChangeWatcher(entry.database).position()) == 2
+
+        # A watcher created after pruning starts from the latest change, not from an empty changelog
+        with ChangeWatcher(entry.database) as fresh:
+            entry.add('item', {'id': "watch_3", 'name': "n", 'desc': "d"})
+            assert fresh.poll().complete
+
+        changes = watcher.poll()
+        assert not changes.complete
+        assert changes
+
+def test_watcher_pruned_empty(migrated_db):
+    with DataEntry(migrated_db) as entry, ChangeWatcher(entry.database) as watcher:
+        entry.add('item', {'id': "watch_1", 'name': "n", 'desc': "d"})
+        entry.add('item', {'id': "watch_2", 'name': "n", 'desc': "d"})
+        prune(entry.database, ChangeWatcher(entry.database).position())
+
+        # Every unseen change was pruned, which an empty changelog alone does not tell
+        changes = watcher.poll()
+        assert (changes.complete, dict(changes.rows)) == (False, {})
+        assert changes
+        assert not watcher.poll()
+
+        # The watcher carries on from the latest change
+        entry.add('item', {'id': "watch_3", 'name': "n", 'desc': "d"})
+        changes = watcher.poll()
+        assert (changes.complete, dict(changes.rows)) == (True, {'item': {"watch_3"}})
+
+def test_watcher_needs_migration(temp_db, monkeypatch):
+    with DataEntry(temp_db) as entry:
+        opened = []
+        connect = entry.database.connect
+
+        def tracked(*args, **kwargs):
+            opened.append(connect(*args, **kwargs))
+            return opened[-1]
+        monkeypatch.setattr(entry.database, "connect", tracked)
+
+        with pytest.raises(MigrationError):
+            ChangeWatcher(entry.database)
+
+        # The watcher's own connection is closed before the error propagates
+        assert len(opened) == 1
+        with pytest.raises(sqlite3.ProgrammingError):
+            opened[0].execute("SELECT 1;")
+
+def test_instantiator_reload(migrated_db):
+    with Instantiator(migrated_db) as inst, DataEntry(migrated_db) as entry, ChangeWatcher(entry.database) as watcher:
+        catalog = inst.build()
+        removed = entry.read('item')[0][1]
+        entry.add('item', {'id': "reload_new", 'name': "new", 'desc': "d"})
+        entry.update('item', removed, {'id': "reload_renamed", 'name': "renamed", 'desc': "d"})
+
+        inst.reload(catalog, watcher.poll(), chunk_size=1)
+        assert catalog == inst.build()
+        assert removed not in catalog['item']
+        assert catalog['item']["reload_renamed"].metadata.name == "renamed"
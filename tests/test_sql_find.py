@@ -0,0 +1,77 @@
+import pytest
+from contextlib import closing
+from sql.entry import DataEntry, SchemaError
+
+ELEMENTS = ("fire", "water", "earth", "air")
+
+@pytest.fixture
+def entry(temp_db):
+    with DataEntry(temp_db) as entry:
+        entry.add_many('equip', (
+            {
+                'id': f"find_{i:03}", 'name': f"{ELEMENTS[i % 4].title()} Blade {i}", 'desc': "d",
+                'element': ELEMENTS[i % 4], 'attribute': None, 'skill': "", 'is_dual_wield': i % 2
+            } for i in range(200)
+        ))
+        entry.migrate()
+        yield entry
+
+def find_ids(rows: list[tuple]) -> list[str]:
+    return [row[1] for row in rows if row[1].startswith("find_")]
+
+def test_find_equality(entry):
+    rows = entry.find('equip', element="fire", dual_wield=0)
+    assert find_ids(rows) == [f"find_{i:03}" for i in range(200) if i % 4 == 0 and i % 2 == 0]
+    assert entry.find('equip', ref_id="find_007") == [entry.get('equip', "find_007")]
+    assert find_ids(entry.find('equip', attribute=None)) == find_ids(entry.read('equip'))
+    assert find_ids(entry.find('equip', attribute__ne=None)) == []
+
+def test_find_range_and_in(entry):
+    rows = entry.find('equip', ref_id__ge="find_010", ref_id__lt="find_020")
+    assert find_ids(rows) == [f"find_{i:03}" for i in range(10, 20)]
+
+    rows = entry.find('equip', order_by="ref_id", element__in=["air", "water"], ref_id__in=("find_001", "find_002", "find_003"))
+    assert find_ids(rows) == ["find_001", "find_003"]
+    assert entry.find('equip', element__in=[]) == []
+
+def test_find_prefix(entry):
+    rows = entry.find('equip', name__startswith="Fire Blade 1")
+    assert sorted(row[2] for row in rows) == sorted(f"Fire Blade {i}" for i in range(200) if i % 4 == 0 and str(i).startswith("1"))
+
+    # Prefix matching is case-sensitive
+    assert entry.find('equip', name__startswith="fire") == []
+    assert len(entry.find('equip', name__startswith="")) == len(entry.read('equip'))
+
+def test_find_order_and_limit(entry):
+    rows = entry.find('equip', element="earth", order_by="-ref_id", limit=3)
+    assert find_ids(rows) == ["find_198", "find_194", "find_190"]
+
+    rows = entry.find('equip', ref_id__startswith="find_", order_by=["dual_wield", "-ref_id"], limit=2)
+    assert find_ids(rows) == ["find_198", "find_196"]
+    assert entry.find('equip', limit=0) == []
+
+def test_find_uses_index(entry):
+    captured = []
+    db_query = entry.database.db_query
+    entry.database.db_query = lambda request, data={}, *args: captured.append((request, data)) or db_query(request, data, *args)
+    entry.find('equip', element="fire", name__startswith="Fire")
+
+    request, data = captured[-1]
+    with closing(entry.database.connect()) as conn:
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {request}", data))
+    assert "USING INDEX" in plan
+    assert "SCAN" not in plan
+
+def test_find_errors(entry):
+    with pytest.raises(SchemaError):
+        entry.find('equip', bogus=1)
+    with pytest.raises(SchemaError):
+        entry.find('equip', order_by="-bogus")
+    with pytest.raises(ValueError):
+        entry.find('equip', element__regex="f.*")
+    with pytest.raises(ValueError):
+        entry.find('equip', element__in="fire")
+    with pytest.raises(ValueError):
+        entry.find('equip', limit=-1)
+    with pytest.raises(ValueError):
+        entry.find('invalid_table', element="fire")
@@ -0,0 +1,63 @@
+import asyncio
+from classes.items.item import Equippable
+from sql.async_entry import AsyncDataEntry
+from sql.entry import DataEntry
+from sql.metrics import QueryMetrics
+
+def fill_items(entry: DataEntry, count: int) -> list[str]:
+    keys = [f"many_{i}" for i in range(count)]
+    entry.add_many('item', ({'id': key, 'name': key, 'desc': "d"} for key in keys))
+    return keys
+
+def test_get_many(temp_db):
+    with DataEntry(temp_db) as entry:
+        rows = entry.read('equip')
+        keys = [rows[1][1], "missing_1", rows[0][1], rows[1][1], "missing_2"]
+
+        result = entry.get_many('equip', keys)
+        assert result.rows == {rows[0][1]: rows[0], rows[1][1]: rows[1]}
+        assert result.missing == ["missing_1", "missing_2"]
+
+        decoded = entry.get_many('equip', keys, decode=True)
+        assert type(decoded.rows[rows[0][1]]) is Equippable
+        assert decoded.rows[rows[0][1]] == entry.get('equip', rows[0][1], decode=True)
+
+        empty = entry.get_many('equip', [])
+        assert empty.rows == {} and empty.missing == []
+
+def test_get_many_one_query(temp_db):
+    metrics = QueryMetrics()
+    with DataEntry(temp_db, metrics=metrics) as entry:
+        keys = fill_items(entry, 5000)
+        metrics.reset()
+
+        result = entry.get_many('item', keys + ["missing"])
+        assert len(result.rows) == 5000
+        assert result.missing == ["missing"]
+        assert metrics.snapshot().queries == 1
+
+def test_get_many_cached(temp_db):
+    metrics = QueryMetrics()
+    with DataEntry(temp_db, cache_size=100, metrics=metrics) as entry:
+        keys = fill_items(entry, 10)
+        entry.get_many('item', keys[:5] + ["missing"])
+        metrics.reset()
+
+        # Cached rows and cached misses are served without touching the database
+        result = entry.get_many('item', keys[:5] + ["missing"])
+        assert len(result.rows) == 5 and result.missing == ["missing"]
+        assert metrics.snapshot().queries == 0
+
+        result = entry.get_many('item', keys)
+        assert set(result.rows) == set(keys)
+        assert metrics.snapshot().queries == 1
+
+        entry.update('item', keys[0], {'id': keys[0], 'name': "renamed", 'desc': "d"})
+        assert entry.get_many('item', keys[:1]).rows[keys[0]][2] == "renamed"
+
+def test_async_get_many(temp_db):
+    async def run():
+        async with AsyncDataEntry(temp_db) as entry:
+            return await entry.get_many('item', ["missing"])
+
+    assert asyncio.run(run()).missing == ["missing"]
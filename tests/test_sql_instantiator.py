@@ -0,0 +1,80 @@
+import os
+import pytest
+from classes.items.effect import ItemEffect, register_effect
+from classes.items.item import Item, GenericUsable, Equippable
+from sql.entry import DataEntry
+from sql.instantiator import Instantiator
+
+def test_instantiator_build(temp_db):
+    with Instantiator(temp_db) as inst:
+        catalog = inst.build()
+    entry = DataEntry(temp_db)
+
+    for table, cls in (('item', Item), ('usable', GenericUsable), ('equip', Equippable)):
+        rows = entry.read(table)
+        assert len(catalog[table]) == len(rows)
+        for row in rows:
+            obj = catalog[table][row[1]]
+            assert type(obj) is cls
+            assert (obj.metadata.id, obj.metadata.name, obj.metadata.description) == row[1:4]
+
+    row = entry.read('equip')[0]
+    equip = catalog['equip'][row[1]]
+    assert (equip.element, equip.attribute, equip.skill, equip.dual_wield) == (row[4], row[5], row[6], bool(row[7]))
+
+def test_instantiator_snapshot(temp_db):
+    with Instantiator(temp_db) as inst:
+        cold = inst.load()
+    assert inst.source == "database"
+    assert os.path.exists(inst.snapshot_path)
+
+    with Instantiator(temp_db) as warm_inst:
+        warm = warm_inst.load()
+    assert warm_inst.source == "snapshot"
+    assert warm == cold
+    assert warm_inst.load_time is not None
+
+def test_instantiator_stale_snapshot(temp_db):
+    with Instantiator(temp_db) as inst:
+        inst.load()
+
+    with DataEntry(temp_db) as entry:
+        entry.add('item', {'id': "fresh_item", 'name': "fresh", 'desc': "desc"})
+
+    with Instantiator(temp_db) as inst:
+        catalog = inst.load()
+    assert inst.source == "database"
+    assert catalog['item']['fresh_item'].metadata.name == "fresh"
+
+def test_instantiator_stale_snapshot_wal(temp_db):
+    # The editor profile keeps commits in the WAL file while the writer stays open
+    with DataEntry(temp_db, profile="editor") as entry:
+        entry.add('item', {'id': "wal_first", 'name': "first", 'desc': "desc"})
+        with Instantiator(temp_db) as inst:
+            inst.load()
+        entry.add('item', {'id': "wal_item", 'name': "wal", 'desc': "desc"})
+
+        with Instantiator(temp_db) as inst:
+            catalog = inst.load()
+        assert inst.source == "database"
+        assert catalog['item']['wal_item'].metadata.name == "wal"
+
+def test_instantiator_corrupt_snapshot(temp_db):
+    with Instantiator(temp_db) as inst:
+        with open(inst.snapshot_path, "wb") as file:
+            file.write(b"not a snapshot")
+
+        inst.load()
+        assert inst.source == "database"
+
+def test_generic_usable():
+    class Heal(ItemEffect):
+        def __call__(self, target, /, **parameters):
+            return target, parameters
+
+    usable = GenericUsable(None, "test_heal", "amount=50;target=self")
+    with pytest.raises(LookupError):
+        usable.use("hero")
+
+    register_effect("test_heal", Heal())
+    assert usable.use("hero") == ("hero", {'amount': 50, 'target': "self"})
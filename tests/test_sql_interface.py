@@ -1,6 +1,9 @@
 import pytest
+import sqlite3
+import threading
 from classes.utils.randgen import randstr, randbool
 from sql.entry import DataEntry, SchemaError
+from sql.interface import SQLInterface
 from sql.lookup import *
 
 TEST_DB_PATH = "tests/test_object_init.db"
@@ -136,4 +139,55 @@ def test_get_table_list():
     for table in table_list:
         if table[0] in ('item', 'equip', 'usable'): continue
         raise AssertionError("invalid table listing")
-    
\ No newline at end of file
+    
+def test_sql_pooled_connection_reuse():
+    inter = SQLInterface(TEST_DB_PATH)
+    assert inter.pooled
+
+    # Same thread reuses its connection
+    assert inter.connection() is inter.connection()
+
+    # Other threads get their own connection
+    other = []
+    thread = threading.Thread(target=lambda: other.append(inter.connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not inter.connection()
+
+    # Closing drops every pooled connection, and the next request reopens lazily
+    first = inter.connection()
+    inter.close()
+    assert inter.connection() is not first
+    assert len(inter.db_query("SELECT 1;")) == 1
+    inter.close()
+
+def test_sql_pooled_connection_released():
+    with SQLInterface(TEST_DB_PATH) as inter:
+        opened = []
+        for _ in range(20):
+            thread = threading.Thread(target=lambda: opened.append(inter.connection()))
+            thread.start()
+            thread.join()
+
+        # Opening a connection closes those of the threads that have exited
+        inter.connection()
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1;")
+
+def test_sql_shared_reads():
+    with SQLInterface(TEST_DB_PATH, shared_reads=True) as inter:
+        ref_id = randstr(10)
+        inter.db_modify(lookup(LookupKey.SQL_CREATE, 'item'), {'id': ref_id, 'name': randstr(10), 'desc': randstr(50)})
+        assert inter.db_query(lookup(LookupKey.SQL_GET, 'item'), {'key': ref_id})[0][1] == ref_id
+
+        # Read-only connections reject writes
+        conn = inter.connect(readonly=True)
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM item;")
+        conn.close()
+
+def test_sql_unpooled():
+    with SQLInterface(TEST_DB_PATH, pooled=False) as inter:
+        assert not inter.pooled
+        assert inter.db_query("SELECT 1;") == [(1,)]
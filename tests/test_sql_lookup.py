@@ -0,0 +1,30 @@
+import pytest
+from sql.entry import DataEntry
+from sql.lookup import lookup, LookupKey, _Statements
+
+def test_lookup_precompiled():
+    for table in ('item', 'usable', 'equip'):
+        for key in (LookupKey.SQL_GET, LookupKey.SQL_READ, LookupKey.SQL_CREATE, LookupKey.SQL_UPDATE):
+            assert (key.value, table) in _Statements
+    assert (LookupKey.SQL_TABLE_LIST.value, "") in _Statements
+
+def test_lookup_values():
+    assert lookup(LookupKey.SQL_GET, 'item') == "SELECT * FROM item WHERE ref_id = :key;"
+    assert lookup('sql_get', 'item') is lookup(LookupKey.SQL_GET, 'item')
+    assert lookup(LookupKey.SQL_READ_COLUMNS, 'item') == "SELECT {columns} FROM item;"
+
+def test_lookup_memoizes_new_tables(temp_db):
+    with DataEntry(temp_db) as entry:
+        entry.database.db_modify("CREATE TABLE memo_table (ref_id TEXT);")
+        assert ('sql_read', 'memo_table') not in _Statements
+
+        request = lookup(LookupKey.SQL_READ, 'memo_table', entry.catalog)
+        assert request == "SELECT * FROM memo_table;"
+        assert _Statements[('sql_read', 'memo_table')] is request
+
+def test_lookup_errors():
+    with pytest.raises(KeyError):
+        lookup('invalid_key')
+    with pytest.raises(ValueError):
+        lookup(LookupKey.SQL_READ, 'invalid_table')
+    assert ('sql_read', 'invalid_table') not in _Statements
@@ -0,0 +1,45 @@
+import sqlite3
+import threading
+import pytest
+from sql.entry import DataEntry
+from sql.interface import SQLInterface
+
+def test_memory_reads_match_file(temp_db):
+    with DataEntry(temp_db) as file_entry, DataEntry(temp_db, in_memory=True) as memory_entry:
+        assert memory_entry.database.in_memory
+        for table in ('item', 'usable', 'equip'):
+            assert memory_entry.read(table) == file_entry.read(table)
+            assert list(memory_entry.iter_read(table)) == file_entry.read(table)
+
+        ref_id = file_entry.read('item')[0][1]
+        assert memory_entry.get('item', ref_id) == file_entry.get('item', ref_id)
+
+def test_memory_rejects_writes(temp_db):
+    with DataEntry(temp_db, in_memory=True) as entry:
+        with pytest.raises(sqlite3.OperationalError):
+            entry.add('item', {'id': "memory_item", 'name': "name", 'desc': "desc"})
+        assert entry.get('item', "memory_item") is None
+
+def test_memory_copy_is_a_snapshot(temp_db):
+    with DataEntry(temp_db) as writer, DataEntry(temp_db, in_memory=True) as reader:
+        count = len(reader.read('item'))
+        writer.add('item', {'id': "late_item", 'name': "name", 'desc': "desc"})
+        assert len(reader.read('item')) == count
+
+        # Closing drops the copy, so the next request reloads it from the file
+        reader.close()
+        assert len(reader.read('item')) == count + 1
+
+def test_memory_shared_across_threads(temp_db):
+    with SQLInterface(temp_db, in_memory=True) as inter:
+        expected = inter.db_query("SELECT * FROM equip;")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(inter.db_query("SELECT * FROM equip;"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [expected] * 4
+
+    with SQLInterface(temp_db, pooled=False, in_memory=True) as inter:
+        assert inter.db_query("SELECT * FROM equip;") == expected
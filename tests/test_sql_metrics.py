@@ -0,0 +1,68 @@
+import logging
+from sql.entry import DataEntry
+from sql.lookup import LookupKey
+from sql.metrics import LATENCY_BUCKETS, QueryMetrics
+
+def test_get_query_budget(temp_db):
+    with DataEntry(temp_db, metrics=QueryMetrics()) as entry:
+        key = entry.read('item')[0][1]
+
+        # The first lookup also loads the table catalog
+        entry.get('item', key)
+        entry.database.metrics.reset()
+
+        entry.get('item', key)
+        snapshot = entry.database.metrics.snapshot()
+        assert snapshot.queries == 1
+        assert snapshot.rows == 1
+        (stats,) = snapshot.statements.values()
+        assert stats.statement == entry.request(LookupKey.SQL_GET, 'item')
+
+def test_cached_get_issues_no_query(temp_db):
+    with DataEntry(temp_db, cache_size=16, metrics=QueryMetrics()) as entry:
+        key = entry.read('item')[0][1]
+        entry.get('item', key)
+        entry.database.metrics.reset()
+
+        entry.get('item', key)
+        assert entry.database.metrics.snapshot().queries == 0
+
+def test_metrics_counters(temp_db):
+    metrics = QueryMetrics()
+    with DataEntry(temp_db, metrics=metrics) as entry:
+        entry.read('item')
+        metrics.reset()
+
+        rows = entry.read('item')
+        entry.read('item')
+        streamed = list(entry.iter_read('usable', batch_size=2))
+        entry.add_many('item', ({'id': f"metrics_{i}", 'name': "m", 'desc': "d"} for i in range(5)))
+        entry.add('item', {'id': "metrics_one", 'name': "m", 'desc': "d"})
+
+    snapshot = metrics.snapshot()
+    read = snapshot.statements["SELECT * FROM item;"]
+    assert read.count == 2
+    assert read.rows == 2 * len(rows)
+    assert sum(read.histogram) == 2
+    assert len(read.histogram) == len(LATENCY_BUCKETS) + 1
+    assert 0 < read.mean_time <= read.max_time
+
+    assert snapshot.statements["SELECT * FROM usable;"].rows == len(streamed)
+    insert = [stats for statement, stats in snapshot.statements.items() if statement.startswith("INSERT INTO item")]
+    assert [(stats.count, stats.rows) for stats in insert] == [(2, 6)]
+
+    metrics.reset()
+    assert metrics.snapshot().queries == 0
+
+def test_slow_query_log(temp_db, caplog):
+    metrics = QueryMetrics(slow_query_time=0.0)
+    with caplog.at_level(logging.WARNING, logger="sql.metrics"), DataEntry(temp_db, metrics=metrics) as entry:
+        entry.database.db_query("SELECT count(*) FROM item;")
+
+    (slow,) = [query for query in metrics.snapshot().slow_queries if query.statement == "SELECT count(*) FROM item;"]
+    assert slow.rows == 1
+    assert "SELECT count(*) FROM item;" in caplog.text
+
+    quiet = QueryMetrics(slow_query_time=60.0)
+    quiet.record("SELECT 1;", 0.001, 1)
+    assert quiet.snapshot().slow_queries == ()
@@ -0,0 +1,53 @@
+import pytest
+from contextlib import closing
+from sql.entry import DataEntry
+from sql.migrations import LATEST_VERSION, MigrationError, current_version
+
+def query_plan(entry: DataEntry, request: str, data: dict = {}) -> str:
+    # EXPLAIN does not check the schema version, so use a fresh connection that sees the latest schema
+    with closing(entry.database.connect()) as conn:
+        return " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {request}", data))
+
+def fill_equips(entry: DataEntry, count: int) -> None:
+    entry.add_many('equip', (
+        {
+            'id': f"mig_{i}", 'name': f"name_{i}", 'desc': "d", 'element': f"element_{i % 50}",
+            'attribute': "", 'skill': "", 'is_dual_wield': int(i % 20 == 0)
+        } for i in range(count)
+    ))
+    entry.add_many('usable', (
+        {'id': f"mig_{i}", 'name': f"name_{i}", 'desc': "d", 'use_type': f"type_{i % 50}", 'use_param': ""}
+        for i in range(count)
+    ))
+
+def test_migrate_versions(temp_db):
+    with DataEntry(temp_db) as entry:
+        assert current_version(entry.database) == 0
+        assert entry.migrate() == list(range(1, LATEST_VERSION + 1))
+        assert current_version(entry.database) == LATEST_VERSION
+
+        # Migrating again is a no-op
+        assert entry.migrate() == []
+
+        with pytest.raises(MigrationError):
+            entry.migrate(0)
+        with pytest.raises(MigrationError):
+            entry.migrate(LATEST_VERSION + 1)
+
+def test_migrate_indexes_used(temp_db):
+    with DataEntry(temp_db) as entry:
+        fill_equips(entry, 2000)
+
+        request = "SELECT * FROM equip WHERE element = :value;"
+        assert "SCAN equip" in query_plan(entry, request, {'value': "element_1"})
+
+        entry.migrate()
+        assert "USING INDEX idx_equip_element" in query_plan(entry, request, {'value': "element_1"})
+        assert "USING INDEX idx_equip_name" in query_plan(entry, "SELECT * FROM equip WHERE name = :value;", {'value': "name_1"})
+        assert "USING INDEX idx_equip_dual_wield" in query_plan(entry, "SELECT * FROM equip WHERE dual_wield = 1;")
+        assert "USING INDEX idx_usable_use_type" in query_plan(entry, "SELECT * FROM usable WHERE use_type = :value;", {'value': "type_1"})
+        assert "USING INDEX idx_item_name" in query_plan(entry, "SELECT * FROM item WHERE name = :value;", {'value': "name_1"})
+
+        # ANALYZE ran, so the planner has statistics for the new indexes
+        stats = {row[1] for row in entry.database.db_query("SELECT * FROM sqlite_stat1;")}
+        assert {'idx_equip_element', 'idx_usable_use_type'} <= stats
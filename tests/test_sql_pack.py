@@ -0,0 +1,51 @@
+import pytest
+from sql.entry import DataEntry
+from sql.pack import ContentPack, PackError, compile_pack
+
+@pytest.fixture
+def pack_path(temp_db, tmp_path) -> str:
+    path = str(tmp_path / "content.pack")
+    with DataEntry(temp_db) as entry:
+        entry.add('usable', {'id': "pack_usable", 'name': "packed", 'desc': "desc", 'use_type': "heal", 'use_param': None})
+        entry.add('item', {'id': "épée", 'name': "unicode", 'desc': "desc"})
+        compile_pack(entry, path)
+    return path
+
+def test_pack_matches_database(temp_db, pack_path):
+    with DataEntry(temp_db) as entry, ContentPack(pack_path) as pack:
+        assert set(pack.tables) == {'item', 'usable', 'equip'}
+        for table in pack.tables:
+            objects = entry.read(table, decode=True)
+            assert pack.count(table) == len(objects)
+            for obj in objects:
+                assert pack.get(table, obj.metadata.id) == obj
+
+def test_pack_lookup(pack_path):
+    with ContentPack(pack_path) as pack:
+        assert pack.row('usable', "pack_usable") == ("pack_usable", "packed", "desc", "heal", None)
+        assert pack.get('item', "épée").metadata.name == "unicode"
+        assert pack.get('item', "missing") is None
+        assert pack.get('item', "") is None
+        with pytest.raises(ValueError):
+            pack.get('player', "pack_usable")
+
+def test_pack_iter(temp_db, pack_path):
+    with ContentPack(pack_path) as pack:
+        packed = list(pack)
+    assert len(packed) == sum(len(DataEntry(temp_db).read(table)) for table in ('item', 'usable', 'equip'))
+
+def test_pack_rejects_foreign_file(tmp_path):
+    path = tmp_path / "bogus.pack"
+    path.write_bytes(b"not a content pack at all, definitely")
+    with pytest.raises(PackError):
+        ContentPack(str(path))
+
+def test_pack_rejects_truncated_file(tmp_path, pack_path):
+    with open(pack_path, "rb") as file:
+        data = file.read()
+
+    path = tmp_path / "truncated.pack"
+    for length in (0, 10, 30, len(data) // 2, len(data) - 1):
+        path.write_bytes(data[:length])
+        with pytest.raises(PackError):
+            ContentPack(str(path))
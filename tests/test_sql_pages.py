@@ -0,0 +1,84 @@
+import pytest
+from contextlib import closing
+from sql.catalog import SchemaError
+from sql.entry import DataEntry
+
+@pytest.fixture
+def entry(temp_db):
+    with DataEntry(temp_db) as entry:
+        entry.add_many('usable', (
+            {
+                'id': f"page_{i:03}", 'name': f"name_{i}", 'desc': "d", 'use_type': f"type_{i % 7}",
+                'use_param': None if i % 5 == 0 else f"param_{i % 11}"
+            } for i in range(200)
+        ))
+        yield entry
+
+def expected_order(entry, column, descending):
+    index = entry.catalog.columns('usable').index(column)
+    rows = sorted(entry.read('usable'), key=lambda row: (row[index] is not None, row[index] or "", row[1]))
+    return [row[1] for row in (reversed(rows) if descending else rows)]
+
+def paged(entry, order_by, limit):
+    keys = []
+    after = None
+    while page := entry.read_page('usable', after, limit, order_by):
+        assert len(page) <= limit
+        keys.extend(row[1] for row in page)
+        after = page[-1][1]
+    return keys
+
+@pytest.mark.parametrize("order_by", ["ref_id", "-ref_id", "name", "use_type", "-use_type", "use_param", "-use_param"])
+def test_read_page_order(entry, order_by):
+    column = order_by.removeprefix("-")
+    assert paged(entry, order_by, 17) == expected_order(entry, column, order_by.startswith("-"))
+
+def test_read_page_window(entry):
+    first = entry.read_page('usable', limit=10)
+    second = entry.read_page('usable', first[-1][1], limit=10)
+    assert [row[1] for row in first + second] == expected_order(entry, "ref_id", False)[:20]
+
+    (obj,) = entry.read_page('usable', limit=1, decode=True)
+    assert obj.metadata.id == first[0][1]
+
+def test_read_page_invalid(entry):
+    with pytest.raises(SchemaError):
+        entry.read_page('usable', order_by="bogus")
+    with pytest.raises(ValueError):
+        entry.read_page('usable', "missing_ref", order_by="name")
+    with pytest.raises(ValueError):
+        entry.read_page('usable', limit=-1)
+
+def test_read_page_uses_index(entry):
+    request = "SELECT * FROM usable WHERE \"ref_id\" > :after ORDER BY \"ref_id\" ASC LIMIT :limit;"
+    with closing(entry.database.connect()) as conn:
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {request}", {'after': "page_100", 'limit': 10}))
+    assert "USING INDEX" in plan
+    assert "TEMP B-TREE" not in plan
+
+@pytest.mark.parametrize("order_by", ["use_type", "-use_type", "name", "-name"])
+def test_read_page_uses_composite_index(entry, order_by):
+    entry.migrate()
+    after = entry.read_page('usable', limit=50, order_by=order_by)[-1][1]
+
+    statements = []
+    entry.database.connection().set_trace_callback(statements.append)
+    entry.read_page('usable', after, 10, order_by)
+    entry.database.connection().set_trace_callback(None)
+
+    # Ties are walked in (column, ref_id) index order, not sorted again on every page
+    pages = [statement for statement in statements if "ORDER BY" in statement]
+    assert pages
+    with closing(entry.database.connect()) as conn:
+        for statement in pages:
+            plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}"))
+            assert "USING INDEX" in plan
+            assert "TEMP B-TREE" not in plan
+
+def test_count(entry):
+    total = len(entry.read('usable'))
+    assert entry.count('usable') == total
+    assert entry.count('usable', ref_id__startswith="page_", use_param=None) == 40
+    assert entry.count('usable', ref_id__startswith="page_", use_type="type_0") == 29
+    with pytest.raises(SchemaError):
+        entry.count('usable', bogus=1)
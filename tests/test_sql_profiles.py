@@ -0,0 +1,45 @@
+import sqlite3
+import pytest
+from sql.entry import DataEntry
+from sql.interface import PRAGMA_PROFILES, SQLInterface
+
+def pragma(inter: SQLInterface, name: str):
+    return inter.db_query(f"PRAGMA {name};")[0][0]
+
+def test_profile_applied(temp_db):
+    with SQLInterface(temp_db, profile="editor") as inter:
+        assert inter.profile == "editor"
+        assert pragma(inter, "journal_mode") == "wal"
+        assert pragma(inter, "synchronous") == 1
+        assert pragma(inter, "cache_size") == PRAGMA_PROFILES['editor']['cache_size']
+
+    with SQLInterface(temp_db, profile="bulk-import") as inter:
+        assert pragma(inter, "synchronous") == 0
+
+    with SQLInterface(temp_db) as inter:
+        assert inter.profile == "default"
+        assert pragma(inter, "synchronous") == 2
+
+def test_profile_runtime_readonly(temp_db):
+    with DataEntry(temp_db, profile="runtime-readonly") as entry:
+        assert pragma(entry.database, "mmap_size") == PRAGMA_PROFILES['runtime-readonly']['mmap_size']
+        assert len(entry.read('item')) > 0
+        with pytest.raises(sqlite3.OperationalError):
+            entry.add('item', {'id': "readonly", 'name': "name", 'desc': "desc"})
+
+def test_profile_editor_readers_not_blocked(temp_db):
+    with DataEntry(temp_db, profile="editor") as writer, DataEntry(temp_db, profile="editor") as reader:
+        with writer.transaction():
+            writer.add('item', {'id': "wal_item", 'name': "name", 'desc': "desc"})
+            assert reader.get('item', "wal_item") is None
+        assert reader.get('item', "wal_item") is not None
+
+def test_profile_in_memory_and_readonly_connections(temp_db):
+    with SQLInterface(temp_db, profile="editor", in_memory=True) as inter:
+        assert len(inter.db_query("SELECT * FROM item;")) > 0
+    with SQLInterface(temp_db, profile="editor", shared_reads=True) as inter:
+        assert len(inter.db_query("SELECT * FROM item;")) > 0
+
+def test_profile_unknown():
+    with pytest.raises(ValueError):
+        SQLInterface(profile="turbo")
@@ -0,0 +1,49 @@
+import pytest
+from classes.items.item import Item, GenericUsable, Equippable
+from sql.entry import DataEntry
+from sql.rows import RowDecoder
+
+def test_decode_get(temp_db):
+    with DataEntry(temp_db, cache_size=8) as entry:
+        entry.add('equip', {
+            'id': "decoded", 'name': "Sword", 'desc': "Sharp", 'element': "fire",
+            'attribute': "strength=5", 'skill': "slash", 'is_dual_wield': 1
+        })
+
+        for _ in range(2):  # Database, then cache
+            equip = entry.get('equip', "decoded", decode=True)
+            assert type(equip) is Equippable
+            assert (equip.metadata.id, equip.metadata.name, equip.metadata.description) == ("decoded", "Sword", "Sharp")
+            assert (equip.element, equip.attribute, equip.skill, equip.dual_wield) == ("fire", "strength=5", "slash", True)
+
+        assert entry.get('equip', "missing", decode=True) is None
+        assert entry.get('equip', "decoded")[1] == "decoded"
+
+def test_decode_read(temp_db):
+    with DataEntry(temp_db) as entry:
+        for table, cls in (('item', Item), ('usable', GenericUsable), ('equip', Equippable)):
+            objects = entry.read(table, decode=True)
+            rows = entry.read(table)
+            assert [type(obj) for obj in objects] == [cls] * len(rows)
+            assert [obj.metadata.id for obj in objects] == [row[1] for row in rows]
+            assert list(entry.iter_read(table, batch_size=7, decode=True)) == objects
+
+        usable = entry.find('usable', limit=1, decode=True)[0]
+        assert (usable.use_type, usable.use_param) == entry.read('usable')[0][4:6]
+
+def test_decode_projection(temp_db):
+    with DataEntry(temp_db) as entry:
+        objects = list(entry.iter_read('item', columns=['desc', 'name', 'ref_id'], decode=True))
+        assert objects == entry.read('item', decode=True)
+
+        with pytest.raises(ValueError):
+            list(entry.iter_read('item', columns=['ref_id'], decode=True))
+
+def test_decoder_layout_cached():
+    decoder = RowDecoder('item')
+    layout = decoder.layout(('item_id', 'ref_id', 'name', 'desc'))
+    assert decoder.layout(['item_id', 'ref_id', 'name', 'desc']) is layout
+    assert layout((1, "id", "name", "desc")).metadata.description == "desc"
+
+    with pytest.raises(ValueError):
+        RowDecoder('sqlite_sequence')
@@ -0,0 +1,56 @@
+import pytest
+from classes.items.item import Item
+from sql.entry import DataEntry
+from sql.migrations import MigrationError
+
+@pytest.fixture
+def entry(temp_db):
+    with DataEntry(temp_db) as entry:
+        entry.migrate()
+        entry.add('item', {'id': "search_sword", 'name': "Flaming Sword", 'desc': "A blade wreathed in fire"})
+        entry.add('item', {'id': "search_torch", 'name': "Torch", 'desc': "Burns with a flaming light"})
+        entry.add('usable', {'id': "search_potion", 'name': "Fire Potion", 'desc': "Résistance au feu", 'use_type': "buff", 'use_param': None})
+        yield entry
+
+def ids(results):
+    return [(table, row[1]) for table, row in results]
+
+def test_search_ranked(entry):
+    # A match in the name outranks a match in the description
+    assert ids(entry.search("flaming")) == [('item', "search_sword"), ('item', "search_torch")]
+    assert ids(entry.search("fire")) == [('usable', "search_potion"), ('item', "search_sword")]
+    assert ids(entry.search("fire", limit=1)) == [('usable', "search_potion")]
+    assert ids(entry.search("fire", tables=['item'])) == [('item', "search_sword")]
+
+def test_search_words(entry):
+    # Every word must match, as a whole word or a prefix, ignoring case and accents
+    assert ids(entry.search("flam BLADE")) == [('item', "search_sword")]
+    assert ids(entry.search("resistance")) == [('usable', "search_potion")]
+    assert entry.search("flaming water") == []
+    assert entry.search("") == []
+    assert entry.search('" OR * (') == []
+
+def test_search_decode(entry):
+    (table, obj), = entry.search("torch", decode=True)
+    assert table == 'item' and type(obj) is Item
+    assert obj.metadata.name == "Torch"
+
+def test_search_follows_writes(entry):
+    entry.update('item', "search_torch", {'id': "search_torch", 'name': "Lantern", 'desc': "Glows softly"})
+    assert ids(entry.search("torch")) == []
+    assert ids(entry.search("lantern")) == [('item', "search_torch")]
+
+    entry.database.db_modify("DELETE FROM item WHERE ref_id = :key;", {'key': "search_torch"})
+    assert entry.search("lantern") == []
+
+def test_search_index_hidden(entry):
+    tables = {row[0] for row in entry.query_table_list()}
+    assert {'item', 'usable', 'equip'} <= tables
+    assert not any("_search" in table for table in tables)
+    with pytest.raises(ValueError):
+        entry.read('item_search')
+
+def test_search_needs_migration(temp_db):
+    with DataEntry(temp_db) as entry:
+        with pytest.raises(MigrationError):
+            entry.search("fire")
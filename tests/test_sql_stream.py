@@ -0,0 +1,34 @@
+import pytest
+from sql.entry import DataEntry, SchemaError
+from sql.interface import SQLInterface
+
+def test_iter_read_matches_read(temp_db):
+    with DataEntry(temp_db) as entry:
+        entry.add_many('item', ({'id': f"stream_{i}", 'name': f"n{i}", 'desc': "d"} for i in range(1234)))
+
+        rows = entry.iter_read('item', batch_size=100)
+        assert iter(rows) is rows
+        assert list(rows) == entry.read('item')
+
+def test_iter_read_projection(temp_db):
+    with DataEntry(temp_db) as entry:
+        projected = list(entry.iter_read('equip', columns=['ref_id', 'dual_wield']))
+        full = entry.read('equip')
+        assert projected == [(row[1], row[7]) for row in full]
+
+        with pytest.raises(SchemaError):
+            next(entry.iter_read('equip', columns=['ref_id', 'bogus']))
+        with pytest.raises(SchemaError):
+            next(entry.iter_read('equip', columns=[]))
+        with pytest.raises(ValueError):
+            next(entry.iter_read('invalid_table'))
+
+def test_db_iter_modes(temp_db):
+    expected = SQLInterface(temp_db).db_query("SELECT * FROM usable;")
+
+    for options in ({}, {'pooled': False}, {'shared_reads': True}):
+        with SQLInterface(temp_db, **options) as inter:
+            assert list(inter.db_iter("SELECT * FROM usable;", batch_size=3)) == expected
+
+    with pytest.raises(ValueError):
+        next(SQLInterface(temp_db).db_iter("SELECT 1;", batch_size=0))
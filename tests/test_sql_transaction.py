@@ -0,0 +1,113 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sql.entry import DataEntry
+
+def item(ref_id: str, name: str = "name") -> dict:
+    return {'id': ref_id, 'name': name, 'desc': "desc"}
+
+def count_commits(entry: DataEntry) -> list[str]:
+    statements = []
+    entry.database.connection().set_trace_callback(statements.append)
+    return statements
+
+def test_transaction_commits_once(temp_db):
+    with DataEntry(temp_db) as entry:
+        statements = count_commits(entry)
+        with entry.transaction():
+            for i in range(100):
+                entry.add('item', item(f"txn_{i}"))
+            entry.update('item', "txn_0", item("txn_renamed"))
+            assert entry.database.in_transaction
+
+        assert not entry.database.in_transaction
+        assert sum(statement.startswith("COMMIT") for statement in statements) == 1
+
+    with DataEntry(temp_db) as other:
+        assert other.get('item', "txn_99") is not None
+        assert other.get('item', "txn_renamed") is not None
+
+def test_transaction_rollback(temp_db):
+    with DataEntry(temp_db) as entry:
+        with pytest.raises(RuntimeError):
+            with entry.transaction():
+                entry.add('item', item("rolled_back"))
+                assert entry.get('item', "rolled_back") is not None
+                raise RuntimeError("abort")
+
+        assert entry.get('item', "rolled_back") is None
+
+def test_transaction_isolated_until_commit(temp_db):
+    with DataEntry(temp_db) as entry, DataEntry(temp_db) as other:
+        with entry.transaction():
+            entry.add('item', item("pending"))
+            assert other.get('item', "pending") is None
+        assert other.get('item', "pending") is not None
+
+def test_transaction_savepoints(temp_db):
+    with DataEntry(temp_db) as entry:
+        with entry.transaction():
+            entry.add('item', item("outer"))
+            with pytest.raises(sqlite3.IntegrityError):
+                with entry.transaction():
+                    entry.add('item', item("inner"))
+                    entry.add('item', item("outer"))
+            with entry.transaction():
+                entry.add('item', item("inner_kept"))
+
+        assert entry.get('item', "outer") is not None
+        assert entry.get('item', "inner") is None
+        assert entry.get('item', "inner_kept") is not None
+
+def test_transaction_bulk_failure(temp_db):
+    with DataEntry(temp_db) as entry:
+        with entry.transaction():
+            rows = [item(f"bulk_{i}") for i in range(10)]
+            rows[5] = item("bulk_0")
+            result = entry.add_many('item', rows, chunk_size=4)
+
+        # The failed chunk was undone through its savepoint, then retried row by row
+        assert [i for i, _, _ in result.failures] == [5]
+        assert len(entry.find('item', ref_id__startswith="bulk_")) == 9
+
+def test_transaction_cache(temp_db):
+    with DataEntry(temp_db, cache_size=16) as entry:
+        with pytest.raises(RuntimeError):
+            with entry.transaction():
+                entry.add('item', item("cached"))
+                assert entry.get('item', "cached") is not None
+                raise RuntimeError("abort")
+
+        # The uncommitted row read inside the transaction is not served from cache
+        assert entry.get('item', "cached") is None
+
+        with entry.transaction():
+            entry.add('item', item("cached"))
+            with pytest.raises(RuntimeError):
+                with entry.transaction():
+                    entry.update('item', "cached", item("cached", "inner"))
+                    assert entry.get('item', "cached")[2] == "inner"
+                    raise RuntimeError("abort")
+            assert entry.get('item', "cached")[2] == "name"
+
+def test_transaction_cache_threads(temp_db):
+    with DataEntry(temp_db, cache_size=16) as entry:
+        with pytest.raises(RuntimeError):
+            with entry.transaction():
+                entry.add('item', item("cached"))
+                assert entry.get('item', "cached") is not None
+                assert entry.get_many('item', ["cached"]).rows
+
+                # Other threads never see the uncommitted row
+                with ThreadPoolExecutor(1) as executor:
+                    assert executor.submit(entry.get, 'item', "cached").result() is None
+                raise RuntimeError("abort")
+
+        assert entry.get('item', "cached") is None
+
+def test_transaction_unpooled(temp_db):
+    with DataEntry(temp_db, pooled=False) as entry:
+        with entry.transaction():
+            entry.add('item', item("unpooled"))
+            assert entry.get('item', "unpooled") is not None
+        assert entry.get('item', "unpooled") is not None
@@ -0,0 +1,98 @@
+import io
+import json
+import shutil
+import pytest
+from sql.entry import DataEntry
+from sql.transfer import detect_format, export_rows, import_rows, main
+
+def equip_rows(count: int) -> list[dict]:
+    return [
+        {
+            'id': f"transfer_{i}", 'name': f"Equip {i}", 'desc': "Line, with \"quotes\"\nand a newline",
+            'element': "fire" if i % 2 else None, 'attribute': "", 'skill': "slash", 'is_dual_wield': i % 2
+        } for i in range(count)
+    ]
+
+@pytest.mark.parametrize("file_format", ["csv", "jsonl"])
+def test_transfer_round_trip(temp_db, tmp_path, file_format):
+    source = tmp_path / f"source.{file_format}"
+    with DataEntry(temp_db) as entry:
+        entry.add_many('equip', equip_rows(250))
+        with open(source, "w", newline="", encoding="utf-8") as file:
+            stats = export_rows(entry, 'equip', file, file_format, batch_size=64)
+        assert stats.rows == len(entry.read('equip'))
+
+    copy_db = tmp_path / "copy.db"
+    shutil.copyfile("sql/object_init.db", copy_db)
+
+    with DataEntry(temp_db) as original, DataEntry(str(copy_db)) as copy, open(source, newline="", encoding="utf-8") as file:
+        stats = import_rows(copy, 'equip', file, file_format, chunk_size=100)
+        assert stats.result.ok
+        assert stats.rows == stats.result.written == len(original.read('equip'))
+
+        imported = {row[1]: row[1:] for row in copy.read('equip')}
+        for row in original.read('equip'):
+            expected = row[1:]
+            if file_format == "csv":
+                # CSV has no NULL: empty text stays empty, NULL text comes back empty
+                expected = tuple("" if value is None else value for value in expected)
+            assert imported[row[1]] == expected
+
+def test_transfer_progress_and_failures(temp_db):
+    lines = [json.dumps(row) for row in equip_rows(30)]
+    lines[10] = json.dumps({'id': "broken"})
+    progress = []
+
+    with DataEntry(temp_db) as entry:
+        stats = import_rows(entry, 'equip', io.StringIO("\n".join(lines)), "jsonl", chunk_size=8, progress=lambda s: progress.append(s.rows), progress_every=10)
+
+    assert progress == [10, 20, 30]
+    assert stats.rows == 30
+    assert stats.result.written == 29
+    assert [i for i, _, _ in stats.result.failures] == [10]
+    assert stats.throughput > 0
+
+def test_transfer_unparsable_records(temp_db):
+    lines = [json.dumps(row) for row in equip_rows(10)]
+    lines[2] = "{not json"
+    lines[5] = json.dumps({'id': "broken"})
+    lines[7] = json.dumps(["not", "an", "object"])
+
+    with DataEntry(temp_db) as entry:
+        stats = import_rows(entry, 'equip', io.StringIO("\n".join(lines)), "jsonl", chunk_size=3)
+        assert stats.rows == 10
+        assert stats.result.written == 7
+        assert [i for i, _, _ in stats.result.failures] == [2, 5, 7]
+        assert isinstance(stats.result.failures[0][2], json.JSONDecodeError)
+        assert len(entry.find('equip', ref_id__startswith="transfer_")) == 7
+
+        text = "id,name,desc,element,attribute,skill,is_dual_wield\n"
+        text += "csv_1,n,d,,,,0\ncsv_2,n,d,,,,yes\ncsv_3,n,d,,,,1\n"
+        stats = import_rows(entry, 'equip', io.StringIO(text), "csv")
+        assert stats.result.written == 2
+        assert [(i, type(error)) for i, _, error in stats.result.failures] == [(1, ValueError)]
+        assert entry.get('equip', "csv_3") is not None
+
+def test_transfer_cli(temp_db, tmp_path, capsys):
+    path = tmp_path / "items.jsonl"
+    path.write_text("".join(json.dumps({'id': f"cli_{i}", 'name': "n", 'desc': "d"}) + "\n" for i in range(5)))
+
+    assert main(["import", "item", str(path), "--db", temp_db, "--chunk-size", "2"]) == 0
+    assert "5 rows" in capsys.readouterr().err
+
+    out = tmp_path / "items.csv"
+    assert main(["export", "item", str(out), "--db", temp_db, "--quiet"]) == 0
+    assert out.read_text().splitlines()[0] == "id,name,desc"
+
+    # Importing the same rows again fails on the unique ref_id, unless they are upserted
+    assert main(["import", "item", str(path), "--db", temp_db, "--quiet"]) == 1
+    path.write_text("".join(json.dumps({'id': f"cli_{i}", 'name': "upserted", 'desc': "d"}) + "\n" for i in range(5)))
+    assert main(["import", "item", str(path), "--db", temp_db, "--quiet", "--upsert"]) == 0
+    with DataEntry(temp_db) as entry:
+        assert [row[2] for row in entry.find('item', ref_id__startswith="cli_")] == ["upserted"] * 5
+
+def test_transfer_detect_format():
+    assert detect_format("content.CSV") == "csv"
+    assert detect_format("content.txt", "jsonl") == "jsonl"
+    with pytest.raises(ValueError):
+        detect_format("content.xml")
@@ -0,0 +1,64 @@
+import sqlite3
+import pytest
+from sql.catalog import SchemaError
+from sql.entry import DataEntry
+from sql.lookup import lookup, LookupKey
+from sql.metrics import QueryMetrics
+
+def usable(ref_id: str, name: str, use_param: str = "p") -> dict:
+    return {'id': ref_id, 'name': name, 'desc': "d", 'use_type': "heal", 'use_param': use_param}
+
+def test_upsert_insert_and_update(temp_db):
+    metrics = QueryMetrics()
+    with DataEntry(temp_db, metrics=metrics) as entry:
+        entry.upsert('usable', usable("upsert_1", "first"))
+        row_id = entry.get('usable', "upsert_1")[0]
+        metrics.reset()
+
+        # The conflicting row is updated in place with a single statement
+        entry.upsert('usable', usable("upsert_1", "second", None))
+        assert metrics.snapshot().queries == 1
+        assert entry.get('usable', "upsert_1") == (row_id, "upsert_1", "second", "d", "heal", None)
+
+def test_upsert_other_conflict(temp_db):
+    with DataEntry(temp_db) as entry:
+        entry.upsert('usable', usable("upsert_1", "taken"))
+
+        # Only ref_id conflicts become updates; usable names stay unique
+        with pytest.raises(sqlite3.IntegrityError):
+            entry.upsert('usable', usable("upsert_2", "taken"))
+        assert entry.get('usable', "upsert_2") is None
+
+        with pytest.raises(SchemaError):
+            entry.upsert('usable', {'id': "upsert_3"})
+
+def test_upsert_after_rename(temp_db):
+    with DataEntry(temp_db, cache_size=16) as entry:
+        entry.upsert('item', {'id': "upsert_old", 'name': "n", 'desc': "d"})
+        assert entry.get('item', "upsert_old") is not None
+        entry.update('item', "upsert_old", {'id': "upsert_new", 'name': "renamed", 'desc': "d"})
+
+        # The old ref_id is free again, so upserting it adds a new row and leaves the renamed one alone
+        entry.upsert('item', {'id': "upsert_old", 'name': "again", 'desc': "d"})
+        assert entry.get('item', "upsert_old")[2] == "again"
+        assert entry.get('item', "upsert_new")[2] == "renamed"
+
+        entry.upsert('item', {'id': "upsert_new", 'name': "updated", 'desc': "d"})
+        assert entry.get('item', "upsert_new")[2] == "updated"
+        assert len(entry.find('item', ref_id__startswith="upsert_")) == 2
+
+def test_upsert_many(temp_db):
+    with DataEntry(temp_db) as entry:
+        entry.add_many('item', ({'id': f"upsert_{i}", 'name': "old", 'desc': "d"} for i in range(5)))
+
+        rows = [{'id': f"upsert_{i}", 'name': "new", 'desc': "d"} for i in range(10)]
+        rows.insert(3, {'id': "broken"})
+        result = entry.upsert_many('item', rows, chunk_size=4)
+
+        assert result.written == 10
+        assert [i for i, _, _ in result.failures] == [3]
+        assert [row[2] for row in entry.find('item', ref_id__startswith="upsert_")] == ["new"] * 10
+
+def test_upsert_precompiled():
+    for table in ('item', 'usable', 'equip'):
+        assert "ON CONFLICT (ref_id) DO UPDATE" in lookup(LookupKey.SQL_UPSERT, table)
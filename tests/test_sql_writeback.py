@@ -0,0 +1,146 @@
+import time
+import pytest
+from sql.entry import DataEntry
+from sql.writeback import WriteBehindError, WriteBehindPolicy
+
+def item(ref_id: str, name: str = "n") -> dict:
+    return {'id': ref_id, 'name': name, 'desc': "d"}
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+def test_write_behind_barrier(temp_db):
+    with DataEntry(temp_db, write_behind=WriteBehindPolicy(interval=60)) as entry:
+        entry.add('item', item("wb_1"))
+        assert entry.get('item', "wb_1") is None
+        assert entry.database.writer.stats().pending == 1
+
+        entry.database.flush()
+        assert entry.get('item', "wb_1") is not None
+        stats = entry.database.writer.stats()
+        assert (stats.pending, stats.written, stats.flushes) == (0, 1, 1)
+        assert 0 < stats.last_flush_time <= stats.max_flush_time
+
+        entry.add('item', item("wb_2"))
+
+    # Closing is a barrier too
+    with DataEntry(temp_db) as entry:
+        assert entry.get('item', "wb_2") is not None
+
+def test_write_behind_coalesces(temp_db):
+    with DataEntry(temp_db, write_behind=WriteBehindPolicy(interval=60)) as entry:
+        entry.add('item', item("wb_1"))
+        for i in range(100):
+            entry.update('item', "wb_1", item("wb_1", f"name_{i}"))
+        entry.add('item', item("wb_2"))
+        entry.upsert('item', item("wb_2", "first"))
+        entry.upsert('item', item("wb_2", "second"))
+        entry.database.flush()
+
+        stats = entry.database.writer.stats()
+        assert stats.submitted == 104
+        assert stats.coalesced == 100
+        assert stats.written == 4
+        assert entry.get('item', "wb_1")[2] == "name_99"
+        assert entry.get('item', "wb_2")[2] == "second"
+
+def test_write_behind_keeps_order_of_mixed_writes(temp_db):
+    with DataEntry(temp_db, write_behind=WriteBehindPolicy(interval=60)) as entry:
+        entry.upsert('item', item("wb_1", "U1"))
+        entry.update('item', "wb_1", item("wb_1", "V"))
+        entry.upsert('item', item("wb_1", "U2"))
+        entry.database.flush()
+        assert entry.get('item', "wb_1")[2] == "U2"
+        assert entry.database.writer.stats().coalesced == 0
+
+        # A write without a key may touch any row, so later writes are not moved ahead of it
+        entry.upsert('item', item("wb_1", "A"))
+        entry.update('item', "wb_1", item("wb_2", "renamed"))
+        entry.upsert('item', item("wb_1", "B"))
+        entry.database.flush()
+        assert entry.get('item', "wb_1")[2] == "B"
+        assert entry.get('item', "wb_2")[2] == "renamed"
+        assert entry.database.writer.stats().coalesced == 0
+
+def test_write_behind_keeps_renames(temp_db):
+    with DataEntry(temp_db, write_behind=WriteBehindPolicy(interval=60)) as entry:
+        entry.add('item', item("wb_old"))
+        entry.update('item', "wb_old", item("wb_new", "renamed"))
+        entry.update('item', "wb_old", item("wb_other", "lost"))
+        entry.database.flush()
+
+        # The second update ran after the rename and found nothing, as it would have synchronously
+        assert entry.get('item', "wb_new")[2] == "renamed"
+        assert entry.get('item', "wb_other") is None
+        assert entry.database.writer.stats().coalesced == 0
+
+def test_write_behind_flushes_by_size_and_time(temp_db):
+    with DataEntry(temp_db, write_behind=WriteBehindPolicy(batch_size=10, interval=60)) as entry:
+        for i in range(25):
+            entry.add('item', item(f"wb_{i}"))
+        wait_for(lambda: entry.database.writer.stats().written == 20)
+        assert entry.database.writer.stats().pending == 5
+
+    with DataEntry(temp_db, write_behind=WriteBehindPolicy(interval=0.01)) as entry:
+        entry.add('item', item("wb_timed"))
+        wait_for(lambda: entry.database.writer.stats().written == 1)
+
+def test_write_behind_failures(temp_db):
+    with DataEntry(temp_db, write_behind=WriteBehindPolicy(interval=60)) as entry:
+        entry.add('item', item("wb_1"))
+        entry.add('item', item("wb_1"))
+        entry.add('item', item("wb_2"))
+
+        with pytest.raises(WriteBehindError) as error:
+            entry.database.flush()
+        assert len(error.value.failures) == 1
+        assert entry.get('item', "wb_2") is not None
+
+        # Failures are only reported once
+        entry.database.flush()
+
+def test_write_behind_unexpected_errors(temp_db):
+    equip = {'id': "wb_equip", 'name': "n", 'desc': "d", 'element': None, 'attribute': None, 'skill': None, 'is_dual_wield': 2**70}
+    with DataEntry(temp_db, write_behind=WriteBehindPolicy(interval=60)) as entry:
+        # Binding the oversized integer raises OverflowError rather than sqlite3.Error
+        entry.add('equip', equip)
+        entry.add('item', item("wb_1"))
+        with pytest.raises(WriteBehindError) as error:
+            entry.database.flush()
+        assert [type(e) for _, _, e in error.value.failures] == [OverflowError]
+        assert entry.get('item', "wb_1") is not None
+
+        def broken(writes):
+            raise RuntimeError("listener failed")
+        entry.database.writer.subscribe(broken)
+        entry.add('item', item("wb_2"))
+        with pytest.raises(WriteBehindError) as error:
+            entry.database.flush()
+        assert isinstance(error.value.failures[0][2], RuntimeError)
+        assert entry.get('item', "wb_2") is not None
+
+def test_write_behind_ordering(temp_db):
+    with DataEntry(temp_db, write_behind=WriteBehindPolicy(interval=60)) as entry:
+        entry.add('item', item("wb_1"))
+        with entry.transaction():
+            assert entry.get('item', "wb_1") is not None
+            entry.update('item', "wb_1", item("wb_1", "in transaction"))
+        assert entry.get('item', "wb_1")[2] == "in transaction"
+
+        entry.add('item', item("wb_2"))
+        assert entry.add_many('item', [item("wb_2")]).failures
+
+def test_write_behind_cache(temp_db):
+    with DataEntry(temp_db, cache_size=16, write_behind=WriteBehindPolicy(interval=60)) as entry:
+        entry.add('item', item("wb_1", "old"))
+        entry.database.flush()
+
+        entry.update('item', "wb_1", item("wb_1", "new"))
+        # Read before the write lands, caching the old row
+        assert entry.get('item', "wb_1")[2] == "old"
+
+        entry.database.flush()
+        assert entry.get('item', "wb_1")[2] == "new"